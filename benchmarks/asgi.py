@@ -0,0 +1,214 @@
+"""
+Бенчмарк ya_news под WSGI и ASGI при медленных клиентах.
+
+Оба сервера поднимаются в этом же процессе на стандартной библиотеке:
+WSGI — wsgiref с фиксированным пулом потоков (как синхронные воркеры),
+ASGI — минимальный HTTP-сервер на asyncio. Клиенты отправляют запрос
+по частям с паузами, поэтому медленный клиент держит соединение.
+
+    python -m benchmarks.asgi --clients 200 --workers 8 --delay 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from time import perf_counter
+from urllib.parse import unquote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+HOST = '127.0.0.1'
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """WSGI-сервер, который обслуживает соединения пулом потоков."""
+    request_queue_size = 1024
+
+    def __init__(self, address, workers):
+        super().__init__(address, QuietHandler)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def start_wsgi(workers):
+    from django.core.wsgi import get_wsgi_application
+
+    server = PooledWSGIServer((HOST, 0), workers)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+async def asgi_connection(application, reader, writer):
+    """Один запрос без тела по HTTP/1.1, соединение закрывается."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    request_line, *lines = head.decode('latin-1').split('\r\n')
+    method, target, _ = request_line.split(' ')
+    path, _, query = target.partition('?')
+    headers = [
+        (name.strip().lower().encode('latin-1'),
+         value.strip().encode('latin-1'))
+        for name, value in (line.split(':', 1) for line in lines if line)
+    ]
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': unquote(path),
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': headers,
+        'client': writer.get_extra_info('peername')[:2],
+        'server': writer.get_extra_info('sockname')[:2],
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            writer.write(
+                f'HTTP/1.1 {message["status"]} -\r\n'.encode()
+                + b''.join(
+                    name + b': ' + value + b'\r\n'
+                    for name, value in message['headers']
+                )
+                + b'Connection: close\r\n\r\n'
+            )
+        elif message['type'] == 'http.response.body':
+            writer.write(message.get('body', b''))
+            await writer.drain()
+
+    try:
+        await application(scope, receive, send)
+    finally:
+        writer.close()
+
+
+def start_asgi():
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(
+        lambda reader, writer: asgi_connection(application, reader, writer),
+        HOST, 0, backlog=1024,
+    ))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return (
+        server.sockets[0].getsockname()[1],
+        lambda: loop.call_soon_threadsafe(loop.stop),
+    )
+
+
+async def slow_get(port, path, delay):
+    """GET, отправленный тремя частями с паузами delay между ними."""
+    started = perf_counter()
+    reader, writer = await asyncio.open_connection(HOST, port)
+    parts = (
+        f'GET {path} HTTP/1.1\r\n',
+        'Host: localhost\r\nUser-Agent: bench\r\n',
+        '\r\n',
+    )
+    for index, part in enumerate(parts):
+        if index:
+            await asyncio.sleep(delay)
+        writer.write(part.encode())
+        await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status = int(response.split(b' ', 2)[1])
+    assert status == 200, (path, status)
+    return perf_counter() - started
+
+
+async def run_clients(port, path, requests, clients, delay):
+    semaphore = asyncio.Semaphore(clients)
+
+    async def one():
+        async with semaphore:
+            return await slow_get(port, path, delay)
+
+    started = perf_counter()
+    timings = await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = perf_counter() - started
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'p50': quantiles[49] * 1000,
+        'p95': quantiles[94] * 1000,
+        'rps': requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Бенчмарк ya_news под WSGI и ASGI.'
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=200,
+                        help='Одновременных медленных клиентов.')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Потоков WSGI-сервера.')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='Пауза между частями запроса, с.')
+    parser.add_argument('--news', type=int, default=500)
+    options = parser.parse_args()
+
+    core.setup_project('ya_news', 'yanews.settings.bench')
+    call_command('seed', news=options.news, comments=20, users=20,
+                 stdout=StringIO())
+    from news.models import News
+
+    news_id = News.objects.order_by('-comment_count').first().pk
+    wsgi_port, stop_wsgi = start_wsgi(options.workers)
+    asgi_port, stop_asgi = start_asgi()
+    cases = (
+        ('WSGI', 'home', wsgi_port, '/'),
+        ('WSGI', 'detail', wsgi_port, f'/news/{news_id}/'),
+        ('ASGI', 'home', asgi_port, '/'),
+        ('ASGI', 'detail', asgi_port, f'/news/{news_id}/'),
+        ('ASGI', 'async home', asgi_port, '/async/'),
+        ('ASGI', 'async detail', asgi_port, f'/async/news/{news_id}/'),
+    )
+    print(f'Клиентов: {options.clients}, потоков WSGI: {options.workers}, '
+          f'пауза: {options.delay * 1000:.0f} мс')
+    print(f'{"сервер":<6} {"страница":<14} {"p50, мс":>9} {"p95, мс":>9} '
+          f'{"RPS":>9}')
+    for server, page, port, path in cases:
+        metrics = asyncio.run(run_clients(
+            port, path, options.requests, options.clients, options.delay
+        ))
+        print(f'{server:<6} {page:<14} {metrics["p50"]:>9.1f} '
+              f'{metrics["p95"]:>9.1f} {metrics["rps"]:>9.1f}')
+    stop_wsgi()
+    stop_asgi()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Микробенчмарк проверки комментария на запрещённые слова.
+
+Сравнивает прежний перебор списка (`word in text` для каждого слова)
+с BadWordsMatcher на списках разного размера.
+
+    python -m benchmarks.bad_words
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'ya_news'))
+
+from news.moderation import BadWordsMatcher  # noqa: E402
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+LIST_SIZES = (10, 100, 1000, 10000, 50000)
+TEXT_WORDS = 300
+REPEAT = 200
+
+
+def random_word(rnd):
+    return ''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(5, 12)))
+
+
+def naive_search(words, text):
+    lowered_text = text.lower()
+    return any(word in lowered_text for word in words)
+
+
+def main():
+    rnd = random.Random(0)
+    # Текст без запрещённых слов — худший случай для обоих способов.
+    text = ' '.join(random_word(rnd)[:6] for _ in range(TEXT_WORDS))
+    print(f'Длина текста: {len(text)} символов, повторов: {REPEAT}')
+    print(f'{"слов":>8} {"перебор, мкс":>14} {"матчер, мкс":>13}')
+    for size in LIST_SIZES:
+        words = [random_word(rnd) for _ in range(size)]
+        matcher = BadWordsMatcher(words)
+        assert naive_search(words, text) == matcher.search(text)
+        naive = timeit.timeit(
+            lambda: naive_search(words, text), number=REPEAT
+        )
+        compiled = timeit.timeit(lambda: matcher.search(text), number=REPEAT)
+        print(
+            f'{size:>8} {naive / REPEAT * 1e6:>14.1f} '
+            f'{compiled / REPEAT * 1e6:>13.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
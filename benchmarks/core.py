@@ -0,0 +1,154 @@
+"""
+Общая часть нагрузочных бенчмарков ya_news и ya_note.
+
+Проект поднимается на временной SQLite-базе, маршруты прогоняются
+тестовым клиентом Django из нескольких потоков, результаты
+сравниваются с сохранённым ранее базовым прогоном.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BASELINES_DIR = Path(__file__).resolve().parent / 'baselines'
+
+
+def setup_project(project, settings_module, database=None):
+    """
+    Настраивает Django для проекта и создаёт пустую базу.
+
+    Без явного пути база создаётся во временном каталоге.
+    """
+    sys.path.insert(0, str(ROOT_DIR / project))
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    import django
+    from django.conf import settings
+
+    if database is None:
+        database = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+    settings.DATABASES['default']['NAME'] = str(database)
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+    return database
+
+
+def base_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--requests', type=int, default=200,
+        help='Запросов на каждый маршрут.'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=4,
+        help='Число параллельных клиентов.'
+    )
+    parser.add_argument(
+        '--baseline', type=Path,
+        help='Файл с базовым прогоном для сравнения.'
+    )
+    parser.add_argument(
+        '--save-baseline', action='store_true',
+        help='Сохранить результаты как новый базовый прогон.'
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='Допустимое ухудшение p95 и RPS относительно базового прогона.'
+    )
+    return parser
+
+
+def percentile(quantiles, value):
+    return quantiles[value - 1]
+
+
+def run_route(make_client, url, requests, workers):
+    """Прогоняет GET-запросы к url и собирает метрики."""
+    def worker(count):
+        client = make_client()
+        timings, queries = [], 0
+        for _ in range(count):
+            started = perf_counter()
+            response = client.get(url)
+            timings.append(perf_counter() - started)
+            assert response.status_code == 200, (url, response.status_code)
+            stats = getattr(response, 'query_stats', None)
+            queries += stats.count if stats else 0
+        return timings, queries
+
+    shares = [
+        requests // workers + (index < requests % workers)
+        for index in range(workers)
+    ]
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(worker, shares))
+    elapsed = perf_counter() - started
+    timings = [timing for result, _ in results for timing in result]
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'p50': percentile(quantiles, 50) * 1000,
+        'p95': percentile(quantiles, 95) * 1000,
+        'p99': percentile(quantiles, 99) * 1000,
+        'rps': len(timings) / elapsed,
+        'queries': sum(queries for _, queries in results) / len(timings),
+    }
+
+
+def run_routes(routes, requests, workers):
+    """routes: {название: (фабрика клиента, url)}."""
+    return {
+        name: run_route(make_client, url, requests, workers)
+        for name, (make_client, url) in routes.items()
+    }
+
+
+def report(results, baseline=None, tolerance=0.2):
+    """Печатает таблицу и возвращает список маршрутов с регрессией."""
+    print(
+        f'{"маршрут":<24} {"p50, мс":>9} {"p95, мс":>9} {"p99, мс":>9} '
+        f'{"RPS":>9} {"запросов":>9}'
+    )
+    regressions = []
+    for name, metrics in results.items():
+        line = (
+            f'{name:<24} {metrics["p50"]:>9.2f} {metrics["p95"]:>9.2f} '
+            f'{metrics["p99"]:>9.2f} {metrics["rps"]:>9.1f} '
+            f'{metrics["queries"]:>9.1f}'
+        )
+        previous = (baseline or {}).get(name)
+        if previous:
+            p95_change = metrics['p95'] / previous['p95'] - 1
+            rps_change = metrics['rps'] / previous['rps'] - 1
+            line += f'  p95 {p95_change:+.0%}, RPS {rps_change:+.0%}'
+            if (
+                p95_change > tolerance
+                or rps_change < -tolerance
+                or metrics['queries'] > previous['queries']
+            ):
+                regressions.append(name)
+                line += '  РЕГРЕССИЯ'
+        print(line)
+    return regressions
+
+
+def finish(project, results, options):
+    """Сравнивает с базовым прогоном и при необходимости сохраняет новый."""
+    path = options.baseline or BASELINES_DIR / f'{project}.json'
+    baseline = json.loads(path.read_text()) if path.exists() else None
+    regressions = report(results, baseline, options.tolerance)
+    if options.save_baseline:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f'Базовый прогон сохранён в {path}')
+    return 1 if regressions and not options.save_baseline else 0
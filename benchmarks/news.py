@@ -0,0 +1,78 @@
+"""
+Нагрузочный бенчмарк ya_news.
+
+    python -m benchmarks.news --news 2000 --comments 20 --users 50
+    python -m benchmarks.news --save-baseline
+"""
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+
+def build_routes():
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from news.models import Comment, News
+    from news.pagination import encode_cursor
+    from news.views import comments_page
+
+    user = get_user_model().objects.get(pk=1)
+
+    def anonymous():
+        return Client()
+
+    def authorized():
+        client = Client()
+        client.force_login(user)
+        return client
+
+    news = News.objects.order_by('-comment_count', 'pk').first()
+    middle = News.objects.all()[News.objects.count() // 2]
+    comment = Comment.objects.filter(author=user).first()
+    _, comments_cursor = comments_page(news.pk)
+    routes = {
+        'home (аноним, кэш)': (anonymous, reverse('news:home')),
+        'home': (authorized, reverse('news:home')),
+        'home, середина ленты': (
+            authorized,
+            reverse('news:home')
+            + f'?cursor={encode_cursor(middle.date, middle.pk)}'
+        ),
+        'detail': (authorized, reverse('news:detail', args=(news.pk,))),
+        'edit': (authorized, reverse('news:edit', args=(comment.pk,))),
+    }
+    if comments_cursor:
+        routes['comments, 2-я страница'] = (
+            authorized,
+            reverse('news:comments', args=(news.pk,))
+            + f'?cursor={comments_cursor}&format=json'
+        )
+    return routes
+
+
+def main():
+    parser = core.base_parser('Нагрузочный бенчмарк ya_news.')
+    parser.add_argument('--news', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=60,
+                        help='Среднее число комментариев к новости.')
+    parser.add_argument('--users', type=int, default=20)
+    options = parser.parse_args()
+
+    core.setup_project('ya_news', 'yanews.settings.bench')
+    call_command(
+        'seed', news=options.news, comments=options.comments,
+        users=options.users, stdout=StringIO()
+    )
+    results = core.run_routes(
+        build_routes(), options.requests, options.workers
+    )
+    return core.finish('news', results, options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
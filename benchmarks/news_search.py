@@ -0,0 +1,100 @@
+"""
+Бенчмарк поиска ya_news.
+
+Сравнивает поиск по индексу FTS5 (news.search) с прямым перебором
+таблиц через icontains на сгенерированном архиве новостей.
+
+    python -m benchmarks.news_search --news 5000 --comments 40
+"""
+import argparse
+import sys
+from io import StringIO
+from time import perf_counter
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+QUERIES = (
+    # Частые слова: совпадает большая часть архива.
+    'город',
+    'фестиваль концерт',
+    'metro',
+    # Редкое слово из NEEDLES, в новостях оно стоит в другой форме.
+    'дирижабль',
+    # Слова нет в архиве — худший случай для перебора.
+    'субмарина',
+)
+NEEDLES = 50
+
+
+def naive_search(query, limit):
+    """Прежний способ: LIKE по всем текстам новостей и комментариев."""
+    from django.db.models import Q
+
+    from news.models import Comment, News
+
+    news_filter, comment_filter = Q(), Q()
+    for word in query.split():
+        news_filter &= Q(title__icontains=word) | Q(text__icontains=word)
+        comment_filter &= Q(text__icontains=word)
+    news = list(News.objects.filter(news_filter)[:limit])
+    comments = list(
+        Comment.objects.filter(comment_filter).select_related(
+            'news', 'author'
+        )[:limit - len(news)]
+    )
+    return news + comments
+
+
+def measure(function, repeat):
+    started = perf_counter()
+    for _ in range(repeat):
+        found = len(function())
+    return (perf_counter() - started) / repeat * 1000, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк поиска ya_news.')
+    parser.add_argument('--news', type=int, default=5000)
+    parser.add_argument('--comments', type=int, default=40,
+                        help='Среднее число комментариев к новости.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=20)
+    options = parser.parse_args()
+
+    core.setup_project('ya_news', 'yanews.settings.bench')
+    call_command(
+        'seed', news=options.news, comments=options.comments, users=20,
+        stdout=StringIO()
+    )
+    from news import search
+    from news.models import News
+
+    # Сгенерированный архив собран из двух десятков слов,
+    # редкие совпадения добавляем отдельно.
+    for index in range(NEEDLES):
+        News.objects.create(
+            title=f'Полёт дирижабля №{index}',
+            text='Над городом пролетел дирижабль.',
+        )
+
+    print(f'{"запрос":<20} {"FTS5, мс":>10} {"найдено":>8} '
+          f'{"icontains, мс":>14} {"найдено":>8}')
+    for query in QUERIES:
+        indexed, indexed_found = measure(
+            lambda: search.search(query, limit=options.limit),
+            options.repeat
+        )
+        naive, naive_found = measure(
+            lambda: naive_search(query, options.limit), options.repeat
+        )
+        print(f'{query:<20} {indexed:>10.2f} {indexed_found:>8} '
+              f'{naive:>14.2f} {naive_found:>8}')
+    # Перебор находит только точные подстроки: без форм слова,
+    # транслита и ранжирования, поэтому числа найденного расходятся.
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
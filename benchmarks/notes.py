@@ -0,0 +1,57 @@
+"""
+Нагрузочный бенчмарк ya_note.
+
+    python -m benchmarks.notes --notes 5000 --users 10
+    python -m benchmarks.notes --save-baseline
+"""
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+
+def build_routes():
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    user = get_user_model().objects.get(pk=1)
+
+    def authorized():
+        client = Client()
+        client.force_login(user)
+        return client
+
+    note = Note.objects.filter(author=user).first()
+    return {
+        'home': (authorized, reverse('notes:home')),
+        'list': (authorized, reverse('notes:list')),
+        'detail': (authorized, reverse('notes:detail', args=(note.slug,))),
+        'edit': (authorized, reverse('notes:edit', args=(note.slug,))),
+        'add': (authorized, reverse('notes:add')),
+    }
+
+
+def main():
+    parser = core.base_parser('Нагрузочный бенчмарк ya_note.')
+    parser.add_argument('--notes', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=10)
+    options = parser.parse_args()
+
+    core.setup_project('ya_note', 'yanote.settings.bench')
+    call_command(
+        'seed', notes=options.notes, users=options.users,
+        stdout=StringIO()
+    )
+    results = core.run_routes(
+        build_routes(), options.requests, options.workers
+    )
+    return core.finish('notes', results, options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
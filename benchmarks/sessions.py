@@ -0,0 +1,118 @@
+"""
+Запросы к базе на авторизованный запрос: профиль dev против bench.
+
+В bench (это prod со счётчиком запросов) сессия хранится в подписанной
+cookie, а пользователь читается из кэша (CachedModelBackend), поэтому
+до вызова view база не читается. Клиенты логинятся так же, как
+в conftest.py и тестах ya_note: Client() и force_login. Каждый профиль
+прогоняется в отдельном процессе на своей временной базе.
+
+    python -m benchmarks.sessions --requests 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews.settings'),
+    'notes': ('ya_note', 'yanote.settings'),
+}
+PROFILES = ('dev', 'bench')
+
+
+def logged_in(user):
+    from django.test import Client
+
+    def make_client():
+        client = Client()
+        client.force_login(user)
+        return client
+    return make_client
+
+
+def news_routes():
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+
+    from news.models import News
+
+    call_command('seed', news=200, comments=5, users=20, stdout=StringIO())
+    author = logged_in(get_user_model().objects.first())
+    news_id = News.objects.order_by('-comment_count').first().pk
+    return {
+        'news:home': (author, reverse('news:home')),
+        'news:detail': (author, reverse('news:detail', args=(news_id,))),
+    }
+
+
+def notes_routes():
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    call_command('seed', notes=200, users=20, stdout=StringIO())
+    user = get_user_model().objects.first()
+    author = logged_in(user)
+    note = Note.objects.filter(author=user).first()
+    return {
+        'notes:list': (author, reverse('notes:list')),
+        'notes:detail': (author, reverse('notes:detail', args=(note.slug,))),
+        'notes:add': (author, reverse('notes:add')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Запросы к базе на авторизованный запрос по профилям.'
+    )
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Запросов на каждый маршрут.')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--project', choices=PROJECTS)
+    parser.add_argument('--profile', choices=PROFILES,
+                        help='Внутренний режим: один прогон в этом процессе.')
+    options = parser.parse_args()
+
+    if options.profile:
+        project_dir, package = PROJECTS[options.project]
+        core.setup_project(project_dir, f'{package}.{options.profile}')
+        routes = news_routes() if options.project == 'news' else notes_routes()
+        print(json.dumps(
+            core.run_routes(routes, options.requests, options.workers)
+        ))
+        return 0
+
+    print(f'{"маршрут":<14} {"запросов":>9} {"в prod":>7} {"убрано":>7} '
+          f'{"p50, мс":>9} {"в prod":>7}')
+    for project in [options.project] if options.project else PROJECTS:
+        results = {}
+        for profile in PROFILES:
+            output = subprocess.run(
+                [
+                    sys.executable, '-m', 'benchmarks.sessions',
+                    '--project', project, '--profile', profile,
+                    '--requests', str(options.requests),
+                    '--workers', str(options.workers),
+                ],
+                cwd=core.ROOT_DIR, check=True, capture_output=True,
+                text=True,
+            ).stdout
+            results[profile] = json.loads(output.splitlines()[-1])
+        for name, base in results['dev'].items():
+            prod = results['bench'][name]
+            print(f'{name:<14} {base["queries"]:>9.2f} '
+                  f'{prod["queries"]:>7.2f} '
+                  f'{base["queries"] - prod["queries"]:>7.2f} '
+                  f'{base["p50"]:>9.2f} {prod["p50"]:>7.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
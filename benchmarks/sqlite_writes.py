@@ -0,0 +1,150 @@
+"""
+Конкурентная запись в SQLite: профиль dev против prod.
+
+Профиль prod запускается как bench — те же настройки плюс счётчик
+запросов и ключ, не требующий окружения.
+
+Каждый профиль прогоняется в отдельном процессе на своей временной
+базе. Потоки создают комментарии (ya_news) или заметки (ya_note);
+каждая запись обрамлена сигналами request_started/request_finished,
+поэтому соединения открываются и закрываются так же, как под
+WSGI-сервером, и CONN_MAX_AGE действует по-настоящему.
+
+    python -m benchmarks.sqlite_writes --threads 8 --writes 200
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from time import perf_counter
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews.settings'),
+    'notes': ('ya_note', 'yanote.settings'),
+}
+PROFILES = ('dev', 'bench')
+
+
+def comment_writer(rnd):
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    news_ids = list(News.objects.values_list('pk', flat=True))
+    user_ids = list(get_user_model().objects.values_list('pk', flat=True))
+    return lambda: Comment.objects.create(
+        news_id=rnd.choice(news_ids),
+        author_id=rnd.choice(user_ids),
+        text='Комментарий для замера записи',
+    )
+
+
+def note_writer(rnd):
+    from django.contrib.auth import get_user_model
+
+    from notes.models import Note
+
+    user_ids = list(get_user_model().objects.values_list('pk', flat=True))
+    return lambda: Note.objects.create(
+        title=f'Заметка {rnd.randrange(10 ** 6)}',
+        text='Заметка для замера записи',
+        author_id=rnd.choice(user_ids),
+    )
+
+
+def run_profile(project, threads, writes):
+    """Прогон в текущем процессе; Django уже настроен."""
+    from django.core.signals import request_finished, request_started
+    from django.db import OperationalError, connections
+
+    if project == 'news':
+        call_command('seed', news=200, comments=5, users=20,
+                     stdout=StringIO())
+        make_writer = comment_writer
+    else:
+        call_command('seed', notes=200, users=20, stdout=StringIO())
+        make_writer = note_writer
+    connections.close_all()
+
+    def worker(index):
+        write = make_writer(random.Random(index))
+        timings, errors = [], 0
+        for _ in range(writes):
+            started = perf_counter()
+            request_started.send(sender=None)
+            try:
+                write()
+            except OperationalError:
+                errors += 1
+            finally:
+                request_finished.send(sender=None)
+            timings.append(perf_counter() - started)
+        connections.close_all()
+        return timings, errors
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(worker, range(threads)))
+    elapsed = perf_counter() - started
+    timings = [timing for result, _ in results for timing in result]
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'wps': len(timings) / elapsed,
+        'p50': quantiles[49] * 1000,
+        'p95': quantiles[94] * 1000,
+        'errors': sum(errors for _, errors in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Конкурентная запись в SQLite по профилям настроек.'
+    )
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200,
+                        help='Записей на поток.')
+    parser.add_argument('--project', choices=PROJECTS)
+    parser.add_argument('--profile', choices=PROFILES,
+                        help='Внутренний режим: один прогон в этом процессе.')
+    options = parser.parse_args()
+
+    if options.profile:
+        project_dir, package = PROJECTS[options.project]
+        core.setup_project(project_dir, f'{package}.{options.profile}')
+        print(json.dumps(
+            run_profile(options.project, options.threads, options.writes)
+        ))
+        return 0
+
+    print(f'Потоков: {options.threads}, записей на поток: {options.writes}')
+    print(f'{"проект":<7} {"профиль":<14} {"записей/с":>10} '
+          f'{"p50, мс":>9} {"p95, мс":>9} {"ошибок":>7}')
+    for project in [options.project] if options.project else PROJECTS:
+        for profile in PROFILES:
+            output = subprocess.run(
+                [
+                    sys.executable, '-m', 'benchmarks.sqlite_writes',
+                    '--project', project, '--profile', profile,
+                    '--threads', str(options.threads),
+                    '--writes', str(options.writes),
+                ],
+                cwd=core.ROOT_DIR, check=True, capture_output=True,
+                text=True,
+            ).stdout
+            metrics = json.loads(output.splitlines()[-1])
+            print(f'{project:<7} {profile:<14} {metrics["wps"]:>10.1f} '
+                  f'{metrics["p50"]:>9.2f} {metrics["p95"]:>9.2f} '
+                  f'{metrics["errors"]:>7}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
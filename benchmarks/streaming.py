@@ -0,0 +1,156 @@
+"""
+Длинные страницы целиком в памяти против потоковой отрисовки.
+
+Страница новости со всеми комментариями (ya_news) и список всех
+заметок (ya_note) рисуются обычным ответом — страница размером
+со весь список — и потоком (NEWS_DETAIL_STREAMING,
+NOTES_LIST_STREAMING). Запрос обрабатывается WSGI-обработчиком
+Django без тестового клиента; замеряются время до первого байта,
+полное время и пик памяти по tracemalloc.
+
+    python -m benchmarks.streaming --sizes 100 1000 10000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+
+from benchmarks import core
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews.settings.bench'),
+    'notes': ('ya_note', 'yanote.settings.bench'),
+}
+
+
+def news_page(size):
+    """Новость с size комментариями и настройки обоих режимов."""
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News, comment_html
+
+    author = get_user_model().objects.create(username=f'Автор {size}')
+    news = News.objects.create(
+        title=f'Новость на {size}', text='Текст', comment_count=size
+    )
+    texts = (f'Комментарий {index} ' * 5 for index in range(size))
+    Comment.objects.bulk_create(
+        Comment(
+            news=news, author=author, text=text, text_html=comment_html(text)
+        )
+        for text in texts
+    )
+    return f'/news/{news.pk}/', {}, {
+        'buffered': {'COMMENTS_COUNT_ON_PAGE': size},
+        'stream': {'NEWS_DETAIL_STREAMING': True},
+    }
+
+
+def notes_page(size):
+    """Автор с size заметками и настройки обоих режимов."""
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    from notes.models import Note
+
+    author = get_user_model().objects.create(username=f'Автор {size}')
+    Note.objects.bulk_create(
+        Note(
+            title=f'Заметка {index}', text='Текст',
+            slug=f'note-{size}-{index}', author=author,
+        )
+        for index in range(size)
+    )
+    client = Client()
+    client.force_login(author)
+    cookie = f'sessionid={client.cookies["sessionid"].value}'
+    return '/notes/', {'HTTP_COOKIE': cookie}, {
+        'buffered': {'NOTES_COUNT_ON_PAGE': size},
+        'stream': {'NOTES_LIST_STREAMING': True},
+    }
+
+
+def measure(handler, environ):
+    """Время до первой части, полное время (мс) и пик памяти (КБ)."""
+    tracemalloc.start()
+    started = perf_counter()
+    first, total = None, 0
+    response = handler(dict(environ), lambda status, headers: None)
+    for chunk in response:
+        if first is None:
+            first = perf_counter() - started
+        total += len(chunk)
+    response.close()
+    elapsed = perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'ttfb': first * 1000,
+        'total': elapsed * 1000,
+        'peak': peak / 1024,
+        'bytes': total,
+    }
+
+
+def run_project(project, sizes, repeat):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory, override_settings
+
+    handler = WSGIHandler()
+    make_page = news_page if project == 'news' else notes_page
+    results = []
+    for size in sizes:
+        url, headers, modes = make_page(size)
+        environ = RequestFactory().get(url, **headers).environ
+        for mode, overrides in modes.items():
+            with override_settings(**overrides):
+                runs = [measure(handler, environ) for _ in range(repeat)]
+            best = {
+                key: min(run[key] for run in runs) for key in runs[0]
+            }
+            results.append({'size': size, 'mode': mode, **best})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Длинные страницы: обычный ответ против потока.'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Прогонов на режим, берётся лучший.')
+    parser.add_argument('--project', choices=PROJECTS,
+                        help='Внутренний режим: один проект в этом процессе.')
+    options = parser.parse_args()
+
+    if options.project:
+        core.setup_project(*PROJECTS[options.project])
+        print(json.dumps(
+            run_project(options.project, options.sizes, options.repeat)
+        ))
+        return 0
+
+    print(f'{"проект":<7} {"записей":>8} {"режим":<9} {"TTFB, мс":>9} '
+          f'{"всего, мс":>10} {"пик, КБ":>9} {"ответ, КБ":>10}')
+    for project in PROJECTS:
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.streaming',
+                '--project', project,
+                '--repeat', str(options.repeat),
+                '--sizes', *map(str, options.sizes),
+            ],
+            cwd=core.ROOT_DIR, check=True, capture_output=True, text=True,
+        ).stdout
+        for row in json.loads(output.splitlines()[-1]):
+            print(f'{project:<7} {row["size"]:>8} {row["mode"]:<9} '
+                  f'{row["ttfb"]:>9.1f} {row["total"]:>10.1f} '
+                  f'{row["peak"]:>9.0f} {row["bytes"] / 1024:>10.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
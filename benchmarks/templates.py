@@ -0,0 +1,169 @@
+"""
+Время отрисовки шаблонов без кэша загрузчика и с кэшем.
+
+Страницы проекта запрашиваются тестовым клиентом, контекст каждого
+отрисованного шаблона запоминается. Затем каждый шаблон рисуется
+с этим контекстом движком с обычными загрузчиками (как при
+DEBUG = True: файл читается и разбирается при каждой отрисовке,
+вместе с base.html и подключаемыми шаблонами) и движком
+с кэширующим загрузчиком из профиля prod.
+
+    python -m benchmarks.templates --repeat 200
+"""
+import argparse
+import json
+import subprocess
+import sys
+from io import StringIO
+from timeit import timeit
+
+from django.core.management import call_command
+
+from benchmarks import core
+
+PROJECTS = {
+    'news': ('ya_news', 'yanews.settings.bench'),
+    'notes': ('ya_note', 'yanote.settings.bench'),
+}
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def news_pages():
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from news.models import Comment, News
+
+    call_command('seed', news=50, comments=5, users=5, stdout=StringIO())
+    user = get_user_model().objects.first()
+    client = Client()
+    client.force_login(user)
+    news = News.objects.order_by('-comment_count').first()
+    comment = Comment.objects.create(news=news, author=user, text='Текст')
+    anonymous = Client()
+    return [
+        (anonymous, reverse('news:home')),
+        (client, reverse('news:detail', args=(news.pk,))),
+        (client, reverse('news:search') + '?q=новость'),
+        (client, reverse('news:edit', args=(comment.pk,))),
+        (client, reverse('news:delete', args=(comment.pk,))),
+        (anonymous, reverse('users:login')),
+        (anonymous, reverse('users:signup')),
+    ]
+
+
+def notes_pages():
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    call_command('seed', notes=200, users=5, stdout=StringIO())
+    user = get_user_model().objects.first()
+    client = Client()
+    client.force_login(user)
+    note = Note.objects.filter(author=user).first()
+    return [
+        (client, reverse('notes:home')),
+        (client, reverse('notes:list')),
+        (client, reverse('notes:detail', args=(note.slug,))),
+        (client, reverse('notes:add')),
+        (client, reverse('notes:edit', args=(note.slug,))),
+        (client, reverse('notes:delete', args=(note.slug,))),
+        (client, reverse('notes:success')),
+        (client, reverse('notes:search') + '?q=заметка'),
+        (client, reverse('notes:import')),
+        (Client(), reverse('users:login')),
+    ]
+
+
+def capture_contexts(pages):
+    """Плоский контекст первой отрисовки каждого шаблона."""
+    from django.test.signals import template_rendered
+
+    contexts = {}
+
+    def on_render(sender, template, context, **kwargs):
+        contexts.setdefault(template.name, context.flatten())
+
+    template_rendered.connect(on_render)
+    try:
+        for client, url in pages:
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+    finally:
+        template_rendered.disconnect(on_render)
+    return contexts
+
+
+def run_project(project, repeat):
+    from django.template import (Context, Engine, TemplateDoesNotExist,
+                                 engines)
+
+    pages = news_pages() if project == 'news' else notes_pages()
+    contexts = capture_contexts(pages)
+    options = dict(
+        dirs=engines['django'].engine.dirs,
+        libraries=engines['django'].engine.libraries,
+    )
+    plain = Engine(loaders=LOADERS, **options)
+    cached = Engine(
+        loaders=[('django.template.loaders.cached.Loader', LOADERS)],
+        **options
+    )
+    results = {}
+    for name, context in sorted(contexts.items()):
+        try:
+            plain.get_template(name)
+        except TemplateDoesNotExist:
+            # Шаблоны виджетов форм рисуются своим движком.
+            continue
+        results[name] = {
+            mode: timeit(
+                lambda: engine.get_template(name).render(Context(context)),
+                number=repeat,
+            ) / repeat * 1000
+            for mode, engine in (('plain', plain), ('cached', cached))
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Отрисовка шаблонов без кэша загрузчика и с кэшем.'
+    )
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='Отрисовок каждого шаблона.')
+    parser.add_argument('--project', choices=PROJECTS,
+                        help='Внутренний режим: один проект в этом процессе.')
+    options = parser.parse_args()
+
+    if options.project:
+        core.setup_project(*PROJECTS[options.project])
+        print(json.dumps(run_project(options.project, options.repeat)))
+        return 0
+
+    print(f'{"проект":<7} {"шаблон":<26} {"без кэша, мс":>13} '
+          f'{"с кэшем, мс":>12} {"ускорение":>10}')
+    for project in PROJECTS:
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.templates',
+                '--project', project, '--repeat', str(options.repeat),
+            ],
+            cwd=core.ROOT_DIR, check=True, capture_output=True, text=True,
+        ).stdout
+        for name, row in json.loads(output.splitlines()[-1]).items():
+            print(f'{project:<7} {name:<26} {row["plain"]:>13.3f} '
+                  f'{row["cached"]:>12.3f} '
+                  f'{row["plain"] / row["cached"]:>9.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.test.client import Client
 
@@ -95,3 +96,9 @@ def list_comments(news, author):
         comment.created = now + timedelta(days=index)
         comment.save()
         list_comment.append(comment)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Каждый тест начинается с пустого кэша"""
+    cache.clear()
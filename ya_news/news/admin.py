@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .cleanup import moderate_comments
 from .models import Comment, News
 
 
@@ -13,3 +14,14 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    actions = ['moderate']
+
+    @admin.action(description='Удалить комментарии с запрещёнными словами')
+    def moderate(self, request, queryset):
+        checked, offenders = moderate_comments(
+            Comment.objects.filter(news__in=queryset)
+        )
+        self.message_user(
+            request,
+            f'Проверено комментариев: {checked}, удалено: {offenders}.'
+        )
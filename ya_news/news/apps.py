@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
     verbose_name = 'Новости'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .moderation import check_bad_words_file
+        from .search import install_fts
+
+        post_migrate.connect(install_fts, sender=self)
+        check_bad_words_file()
@@ -0,0 +1,96 @@
+"""
+Асинхронные варианты читающих страниц для запуска под ASGI.
+
+ORM и кэш в Django 3.2 синхронные, поэтому все обращения к базе
+и кэшу (DatabaseCache тоже ходит в базу), включая ленивую загрузку
+пользователя, выполняются через sync_to_async и возвращают готовые
+списки. Шаблоны рисуются уже без запросов, кроме ленты: её фрагменты
+берутся из кэша.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from . import cache as news_cache
+from .forms import CommentForm
+from .views import (comments_json, comments_page, detail_news,
+                    existing_comments_page, home_page, news_etag)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def _is_authenticated(request):
+    return request.user.is_authenticated
+
+
+def _etag(request, pk):
+    return quote_etag(news_etag(request, pk))
+
+
+async def news_list(request):
+    """Лента новостей, как NewsList."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    cursor = request.GET.get('cursor')
+    key = None
+    if not cursor and not await sync_to_async(_is_authenticated)(request):
+        key = await sync_to_async(news_cache.home_page_key)()
+        content = await sync_to_async(cache.get)(key)
+        if content is not None:
+            return HttpResponse(content)
+    news, next_cursor = await sync_to_async(home_page)(cursor)
+    # Фрагменты ленты ({% cache %}) читаются из кэша при отрисовке.
+    response = await sync_to_async(render)(request, 'news/home.html', {
+        'object_list': news,
+        'fragment_timeout': settings.NEWS_CACHE_TIMEOUT,
+        'next_cursor': next_cursor,
+    })
+    if key is not None:
+        await sync_to_async(cache.set)(
+            key, response.content, settings.NEWS_CACHE_TIMEOUT
+        )
+    return response
+
+
+async def news_detail(request, pk):
+    """Страница новости, как NewsDetail; комментарии отправляются туда."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    etag = await sync_to_async(_etag)(request, pk)
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return response
+    # Новость уже загружена валидаторами и запомнена на запросе.
+    news = detail_news(request, pk)
+    comments, next_cursor = await sync_to_async(comments_page)(pk)
+    context = {
+        'object': news,
+        'news': news,
+        'comments': comments,
+        'next_cursor': next_cursor,
+        'news_id': pk,
+    }
+    if request.user.is_authenticated:
+        context['form'] = CommentForm()
+    response = render(request, 'news/detail.html', context)
+    response['ETag'] = etag
+    return response
+
+
+async def news_comments(request, pk):
+    """Следующие страницы комментариев, как NewsComments."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    comments, next_cursor = await sync_to_async(existing_comments_page)(
+        pk, request.GET.get('cursor')
+    )
+    if request.GET.get('format') == 'json':
+        return JsonResponse(comments_json(comments, next_cursor))
+    await sync_to_async(_is_authenticated)(request)
+    return render(request, 'news/comments.html', {
+        'comments': comments, 'next_cursor': next_cursor, 'news_id': pk,
+    })
@@ -0,0 +1,61 @@
+import time
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+HOME_PAGE_VERSION_KEY = 'news:home:version'
+# Имя фрагмента совпадает с тегом {% cache %} в news/home.html.
+NEWS_FRAGMENT_NAME = 'news_item'
+
+
+def home_page_key():
+    """
+    Ключ закэшированной первой страницы ленты для текущей её версии.
+
+    Следующие страницы не кэшируются: курсор приходит от клиента,
+    и ключ по нему позволил бы забить кэш произвольными страницами.
+    """
+    version = cache.get(HOME_PAGE_VERSION_KEY)
+    if version is None:
+        version = bump_home_page()
+    return f'news:home:{version}'
+
+
+def bump_home_page():
+    """
+    Сбрасывает все закэшированные варианты главной страницы.
+
+    Версия берётся из времени, поэтому потеря ключа версии
+    не возвращает к старым записям в кэше.
+    """
+    version = time.time_ns()
+    cache.set(HOME_PAGE_VERSION_KEY, version, None)
+    return version
+
+
+def _drop_news(news_id):
+    cache.delete(make_template_fragment_key(NEWS_FRAGMENT_NAME, [news_id]))
+    bump_home_page()
+
+
+def invalidate_news(news_id):
+    """Сбрасывает фрагмент новости и главную страницу."""
+    # Второй сброс после коммита: иначе параллельный запрос мог
+    # успеть положить в кэш страницу, прочитанную до коммита.
+    _drop_news(news_id)
+    transaction.on_commit(lambda: _drop_news(news_id))
+
+
+def invalidate_news_many(news_ids):
+    """
+    Сбрасывает фрагменты перечисленных новостей и главную страницу.
+
+    Для массовых изменений через QuerySet.update(): сигналы
+    при нём не рассылаются.
+    """
+    cache.delete_many([
+        make_template_fragment_key(NEWS_FRAGMENT_NAME, [news_id])
+        for news_id in news_ids
+    ])
+    bump_home_page()
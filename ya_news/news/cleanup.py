@@ -0,0 +1,79 @@
+"""
+Удаление комментариев с запрещёнными словами.
+
+Отделено от news.moderation: матчер не зависит от моделей
+и импортируется без настройки Django (benchmarks.bad_words).
+"""
+from collections import Counter
+
+from django.db import connections, router, transaction
+
+from . import cache, search
+from .models import Comment, News
+from .moderation import get_matcher
+
+
+def delete_comments(pks):
+    """
+    Удаляет комментарии одним DELETE ... WHERE id IN.
+
+    Сигналы не рассылаются, поэтому записи убираются из поискового
+    индекса здесь же, а счётчики и кэш обновляются один раз на каждую
+    новость. Счётчики сдвигаются по строкам, которые ещё есть в базе:
+    комментарий, удалённый обычным путём после проверки, не вычитается
+    второй раз.
+    """
+    using = router.db_for_write(Comment)
+    with transaction.atomic(using=using):
+        rows = list(
+            Comment.objects.using(using).select_for_update()
+            .filter(pk__in=pks).values_list('pk', 'news_id')
+        )
+        if not rows:
+            return 0
+        pks = [pk for pk, _ in rows]
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {Comment._meta.db_table} '
+                f'WHERE {Comment._meta.pk.column} IN '
+                f'({", ".join(["%s"] * len(pks))})',
+                pks,
+            )
+        search.unindex(Comment, pks, using)
+        per_news = Counter(news_id for _, news_id in rows)
+        for news_id, count in per_news.items():
+            News.shift_comment_count(news_id, -count)
+    for news_id in per_news:
+        cache.invalidate_news(news_id)
+    return len(rows)
+
+
+def moderate_comments(queryset=None, batch_size=1000, dry_run=False):
+    """
+    Повторно проверяет сохранённые комментарии на запрещённые слова.
+
+    Комментарии читаются пачками по batch_size в порядке id, нарушители
+    каждой пачки удаляются до чтения следующей, поэтому в памяти не
+    больше одной пачки. Возвращает число проверенных и найденных
+    комментариев.
+    """
+    if queryset is None:
+        queryset = Comment.objects.all()
+    matcher = get_matcher()
+    rows = queryset.order_by('pk').values_list('pk', 'text')
+    checked = found = 0
+    last_pk = None
+    while True:
+        # Пачка читается целиком до удаления: SQLite не изолирует
+        # запросы внутри одного соединения.
+        page = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            break
+        offenders = [pk for pk, text in batch if matcher.search(text)]
+        checked += len(batch)
+        found += len(offenders)
+        if offenders and not dry_run:
+            delete_comments(offenders)
+        last_pk = batch[-1][0]
+    return checked, found
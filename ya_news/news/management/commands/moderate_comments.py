@@ -0,0 +1,34 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from news.cleanup import moderate_comments
+
+
+class Command(BaseCommand):
+    help = (
+        'Проверяет все комментарии на запрещённые слова '
+        'и удаляет нарушителей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Размер пачки при чтении и удалении.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только посчитать нарушителей, ничего не удалять.'
+        )
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        checked, offenders = moderate_comments(
+            batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+        elapsed = perf_counter() - started
+        action = 'найдено' if options['dry_run'] else 'удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено комментариев: {checked}, {action}: {offenders} '
+            f'за {elapsed:.2f} с ({checked / max(elapsed, 1e-9):.0f} в с)'
+        ))
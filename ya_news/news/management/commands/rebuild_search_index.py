@@ -0,0 +1,17 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from news.search import install_fts, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс новостей и комментариев.'
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        install_fts()
+        rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен за {perf_counter() - started:.1f} с'
+        ))
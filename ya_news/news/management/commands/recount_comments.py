@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from news import cache
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчик комментариев у всех новостей.'
+
+    def handle(self, *args, **options):
+        updated = News.recount_comments()
+        cache.invalidate_news_many(News.objects.values_list('pk', flat=True))
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено новостей: {updated}')
+        )
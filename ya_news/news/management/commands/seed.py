@@ -0,0 +1,121 @@
+import random
+from datetime import date, timedelta
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from yacommon.seeding import chunked, fast_sqlite, next_id, without_indexes
+
+from news import search
+from news.models import Comment, News, comment_html, news_excerpt
+
+User = get_user_model()
+
+WORDS = (
+    'город', 'новость', 'погода', 'спорт', 'выборы', 'театр', 'рынок',
+    'школа', 'наука', 'дорога', 'праздник', 'музей', 'парк', 'концерт',
+    'мост', 'футбол', 'выставка', 'метро', 'фестиваль', 'библиотека',
+)
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу большим объёмом случайных новостей и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=1000)
+        parser.add_argument(
+            '--comments', type=int, default=20,
+            help='Среднее число комментариев к новости.'
+        )
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора, одинаковое зерно даёт одинаковые данные.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        with fast_sqlite(), without_indexes(News, Comment):
+            with transaction.atomic():
+                counts = self.seed(
+                    random.Random(options['seed']),
+                    options['news'],
+                    options['comments'],
+                    options['users'],
+                    options['batch_size'],
+                )
+                # bulk_create не рассылает сигналы, индекс строим целиком.
+                search.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Создано пользователей: {}, новостей: {}, комментариев: {} '
+            'за {:.1f} с'.format(*counts, perf_counter() - started)
+        ))
+
+    def texts(self, rnd, min_words, max_words, count=1000):
+        """Набор заранее собранных текстов: генерация на строку дорога."""
+        return [
+            ' '.join(
+                rnd.choices(WORDS, k=rnd.randint(min_words, max_words))
+            ).capitalize() + '.'
+            for _ in range(count)
+        ]
+
+    def seed(self, rnd, news_count, comments, users_count, batch_size):
+        titles = [title[:50] for title in self.texts(rnd, 2, 4)]
+        news_texts = self.texts(rnd, 20, 80)
+        comment_texts = self.texts(rnd, 3, 40)
+        # bulk_create обходит save(): производные поля считаем сами,
+        # по разу на заготовленный текст.
+        excerpts = {text: news_excerpt(text) for text in news_texts}
+        comment_htmls = {text: comment_html(text) for text in comment_texts}
+        first_user = next_id(User)
+        # Хеш считается один раз: вход под этими пользователями не нужен.
+        password = make_password(None)
+        users = (
+            User(
+                id=first_user + index,
+                username=f'seed-{first_user + index}',
+                password=password,
+            )
+            for index in range(users_count)
+        )
+        for batch in chunked(users, batch_size):
+            User.objects.bulk_create(batch)
+
+        first_news = next_id(News)
+        comment_counts = [
+            rnd.randint(0, 2 * comments) for _ in range(news_count)
+        ]
+        today = date.today()
+        news = (
+            News(
+                id=first_news + index,
+                title=rnd.choice(titles),
+                text=rnd.choice(news_texts),
+                date=today - timedelta(days=rnd.randint(0, 3650)),
+                comment_count=comment_counts[index],
+            )
+            for index in range(news_count)
+        )
+        for batch in chunked(news, batch_size):
+            for item in batch:
+                item.excerpt = excerpts[item.text]
+            News.objects.bulk_create(batch)
+
+        comment_list = (
+            Comment(
+                news_id=first_news + index,
+                author_id=first_user + rnd.randrange(users_count),
+                text=rnd.choice(comment_texts),
+            )
+            for index, count in enumerate(comment_counts)
+            for _ in range(count)
+        )
+        for batch in chunked(comment_list, batch_size):
+            for comment in batch:
+                comment.text_html = comment_htmls[comment.text]
+            Comment.objects.bulk_create(batch)
+        return users_count, news_count, sum(comment_counts)
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:09
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created(apps, schema_editor):
+    Comment = apps.get_model('news', 'Comment')
+    Comment.objects.update(updated=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_comment_news_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_created, migrations.RunPython.noop),
+    ]
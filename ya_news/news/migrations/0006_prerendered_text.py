@@ -0,0 +1,55 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:30
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+
+def fill(model, field, render):
+    """Заполняет field по text пачками по возрастанию pk."""
+    last_pk = 0
+    while True:
+        batch = list(
+            model.objects.filter(pk__gt=last_pk).only('text')
+            .order_by('pk')[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        for obj in batch:
+            setattr(obj, field, render(obj.text))
+        model.objects.bulk_update(batch, [field])
+        last_pk = batch[-1].pk
+
+
+def fill_prerendered(apps, schema_editor):
+    fill(
+        apps.get_model('news', 'News'), 'excerpt',
+        lambda text: Truncator(text).words(15, truncate=' …'),
+    )
+    fill(
+        apps.get_model('news', 'Comment'), 'text_html',
+        lambda text: linebreaksbr(text, autoescape=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_comment_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_prerendered, migrations.RunPython.noop),
+    ]
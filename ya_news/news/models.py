@@ -2,21 +2,74 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 15
+
+
+def news_excerpt(text):
+    """Начало новости для ленты, как {{ text|truncatewords:15 }}."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def comment_html(text):
+    """HTML комментария, как {{ text|linebreaksbr }}."""
+    return linebreaksbr(text, autoescape=True)
+
+
+def with_derived_field(update_fields, source, derived):
+    """update_fields, дополненные вычисляемым полем при изменении source."""
+    if update_fields is None or source not in update_fields:
+        return update_fields
+    return {*update_fields, derived}
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Вычисляются при сохранении, шаблоны их только выводят.
+    excerpt = models.TextField(blank=True, editable=False)
 
     class Meta:
-        ordering = ('-date',)
+        ordering = ('-date', '-id')
+        indexes = (
+            models.Index(fields=('-date', '-id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, update_fields=None, **kwargs):
+        self.excerpt = news_excerpt(self.text)
+        super().save(*args, update_fields=with_derived_field(
+            update_fields, 'text', 'excerpt'
+        ), **kwargs)
+
+    @classmethod
+    def shift_comment_count(cls, news_id, delta):
+        """Сдвигает счётчик комментариев новости без её загрузки."""
+        cls.objects.filter(pk=news_id).update(
+            comment_count=models.F('comment_count') + delta
+        )
+
+    @classmethod
+    def recount_comments(cls):
+        """Пересчитывает счётчики комментариев у всех новостей."""
+        comments = Comment.objects.filter(
+            news=models.OuterRef('pk')
+        ).order_by().values('news').annotate(
+            total=models.Count('pk')
+        ).values('total')
+        return cls.objects.update(
+            comment_count=Coalesce(models.Subquery(comments), 0)
+        )
+
 
 class Comment(models.Model):
     news = models.ForeignKey(
@@ -28,10 +81,24 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
     )
     text = models.TextField()
+    text_html = models.TextField(blank=True, editable=False)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ('created',)
+        ordering = ('created', 'id')
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.text_html = comment_html(self.text)
+        super().save(*args, update_fields=with_derived_field(
+            update_fields, 'text', 'text_html'
+        ), **kwargs)
@@ -0,0 +1,139 @@
+import logging
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+BAD_WORDS = (
+    'редиска',
+    'негодяй',
+    # Дополните список на своё усмотрение.
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_matcher = None
+_source = None
+
+
+def _trie_pattern(node):
+    """Регулярное выражение для поддерева префиксного дерева слов."""
+    if '' in node:
+        # Слово закончилось: более длинные продолжения уже не важны.
+        return ''
+    branches, chars = [], []
+    for char, child in sorted(node.items()):
+        tail = _trie_pattern(child)
+        if tail:
+            branches.append(re.escape(char) + tail)
+        else:
+            chars.append(re.escape(char))
+    if len(chars) == 1:
+        branches.append(chars[0])
+    elif chars:
+        branches.append('[' + ''.join(chars) + ']')
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+class BadWordsMatcher:
+    """
+    Поиск запрещённых слов за один проход по тексту.
+
+    Слова складываются в префиксное дерево и компилируются
+    в одно регулярное выражение, поэтому время проверки
+    определяется длиной текста, а не размером списка.
+    """
+
+    def __init__(self, words):
+        trie = {}
+        for word in words:
+            word = word.strip().lower()
+            if not word:
+                continue
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self.regex = re.compile(_trie_pattern(trie) if trie else '(?!)')
+
+    def search(self, text):
+        return self.regex.search(text.lower()) is not None
+
+
+def load_words(path):
+    """Слова из файла: по одному в строке, строки с # пропускаются."""
+    with open(path, encoding='utf-8') as file:
+        return [
+            line.strip() for line in file
+            if line.strip() and not line.startswith('#')
+        ]
+
+
+def _read_source(path):
+    """Слова из файла и его mtime; None вместо слов, если файл не прочитать."""
+    try:
+        return load_words(path), os.stat(path).st_mtime_ns
+    except OSError as error:
+        logger.warning(
+            'Не удалось прочитать BAD_WORDS_FILE %s: %s. '
+            'Используется прежний список слов.', path, error
+        )
+        return None, None
+
+
+def get_matcher():
+    """
+    Матчер для текущего списка слов.
+
+    Если задан BAD_WORDS_FILE, файл перечитывается после изменения.
+    Пропавший или нечитаемый файл не ломает проверку: остаётся
+    последний прочитанный список (или BAD_WORDS), в лог пишется
+    предупреждение — один раз, пока файл не появится снова.
+    """
+    global _matcher, _source
+    path = settings.BAD_WORDS_FILE
+    source = None
+    if path:
+        try:
+            source = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            source = (path, None)
+    if _matcher is None or source != _source:
+        with _lock:
+            if _matcher is None or source != _source:
+                words = BAD_WORDS
+                if path:
+                    loaded, mtime = _read_source(path)
+                    if loaded is not None:
+                        words, source = loaded, (path, mtime)
+                    elif _matcher is not None:
+                        _source = source
+                        return _matcher
+                _matcher, _source = BadWordsMatcher(words), source
+    return _matcher
+
+
+def check_bad_words_file():
+    """
+    Проверяет BAD_WORDS_FILE при старте процесса.
+
+    Опечатка в пути обнаруживается сразу, а не первым комментарием.
+    """
+    path = settings.BAD_WORDS_FILE
+    if path and not os.path.isfile(path):
+        raise ImproperlyConfigured(f'BAD_WORDS_FILE {path} не найден.')
+
+
+def reload_bad_words():
+    """Принудительно пересобирает матчер при следующей проверке."""
+    global _matcher
+    _matcher = None
+
+
+def contains_bad_words(text):
+    return get_matcher().search(text)
@@ -0,0 +1,43 @@
+from django.db.models import Q
+from django.http import Http404
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+def encode_cursor(value, pk):
+    """Непрозрачный курсор из значения поля сортировки и первичного ключа."""
+    return urlsafe_base64_encode(f'{value.isoformat()}|{pk}'.encode())
+
+
+def decode_cursor(cursor, parse_value):
+    """Разбирает курсор, на некорректный отвечаем 404."""
+    try:
+        value, pk = force_str(urlsafe_base64_decode(cursor)).split('|')
+        return parse_value(value), int(pk)
+    except (TypeError, ValueError):
+        raise Http404('Некорректный курсор страницы.')
+
+
+def keyset_page(queryset, field, size, cursor=None, parse_value=None,
+                descending=True):
+    """
+    Страница выборки по ключу (field, pk) вместо OFFSET.
+
+    Возвращает объекты страницы и курсор следующей страницы
+    (None, если страница последняя).
+    """
+    if cursor:
+        value, pk = decode_cursor(cursor, parse_value)
+        lookup = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            **{f'{field}__{lookup}e': value}
+        ).filter(
+            Q(**{f'{field}__{lookup}': value}) | Q(**{f'pk__{lookup}': pk})
+        )
+    ordering = (f'-{field}', '-pk') if descending else (field, 'pk')
+    objects = list(queryset.order_by(*ordering)[:size + 1])
+    if len(objects) <= size:
+        return objects, None
+    objects = objects[:size]
+    last = objects[-1]
+    return objects, encode_cursor(getattr(last, field), last.pk)
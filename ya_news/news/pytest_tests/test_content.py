@@ -1,7 +1,18 @@
+import gzip
+import zlib
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from io import StringIO
+
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
 
+from news import cache as news_cache
+from news.models import Comment, News
+
 
 @pytest.mark.django_db
 def test_news_count(client, list_news):
@@ -59,3 +70,256 @@ def test_anonymous_client_has_no_form(parametrized_client, status, comment):
     response = parametrized_client.get(url)  # Act
 
     assert ('form' in response.context) == status  # Assert
+
+
+@pytest.mark.django_db
+def test_home_page_cached_for_anonymous(
+        client, list_news, django_assert_num_queries):
+    """Главная страница для анонима отдаётся из кэша"""
+    url = reverse('news:home')
+    first_response = client.get(url)
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+
+    assert response.content == first_response.content
+
+
+@pytest.mark.django_db
+def test_home_page_cache_invalidated(client, news, author):
+    """Кэш главной страницы сбрасывается после изменений"""
+    url = reverse('news:home')
+    client.get(url)
+
+    news.title = 'Свежий заголовок'
+    news.save()
+    response = client.get(url)
+    assert 'Свежий заголовок' in response.content.decode()
+
+    Comment.objects.create(news=news, author=author, text='Текст')
+    response = client.get(url)
+    assert 'Комментариев: 1' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_home_page_cache_reset_after_commit(
+        client, news, django_capture_on_commit_callbacks):
+    """Страница, закэшированная до коммита правки, сбрасывается после него"""
+    url = reverse('news:home')
+    with django_capture_on_commit_callbacks(execute=True):
+        news.title = 'Свежий заголовок'
+        news.save()
+        # Параллельный запрос до коммита видит прежнюю новость.
+        cache.set(news_cache.home_page_key(), b'stale')
+
+    response = client.get(url)
+
+    assert 'Свежий заголовок' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_home_page_cursor_not_cached(client):
+    """Страницы ленты по курсору не попадают в кэш"""
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст')
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+    )
+    url = reverse('news:home')
+    cursor = client.get(url).context['next_cursor']
+    client.get(url, {'cursor': cursor})
+
+    response = client.get(url, {'cursor': cursor})
+
+    assert response.context is not None
+    assert len(response.context['object_list']) == 1
+
+
+@pytest.mark.django_db
+def test_news_feed_pagination(client):
+    """Лента листается курсором без пропусков и повторов"""
+    today = datetime.today()
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст',
+             date=today - timedelta(days=index // 3))
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE * 2 + 5)
+    )
+    url, seen = reverse('news:home'), []
+
+    while url:
+        response = client.get(url)
+        seen.extend(response.context['object_list'])
+        cursor = response.context['next_cursor']
+        url = cursor and reverse('news:home') + f'?cursor={cursor}'
+
+    assert seen == list(News.objects.all())
+
+
+@pytest.mark.django_db
+def test_news_feed_bad_cursor(client):
+    """Некорректный курсор ведёт на 404"""
+    response = client.get(reverse('news:home') + '?cursor=garbage')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_comments_paginated(client, news, author, settings):
+    """Комментарии отдаются страницами, остальные — по курсору"""
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    for index in range(5):
+        Comment.objects.create(news=news, author=author, text=f'Текст {index}')
+    response = client.get(reverse('news:detail', args=(news.id,)))
+    texts = [comment.text for comment in response.context['comments']]
+    cursor = response.context['next_cursor']
+    url = reverse('news:comments', args=(news.id,))
+
+    while cursor:
+        page = client.get(url, {'cursor': cursor, 'format': 'json'}).json()
+        texts.extend(comment['text'] for comment in page['comments'])
+        cursor = page['next_cursor']
+
+    assert texts == [f'Текст {index}' for index in range(5)]
+
+
+def search_hits(client, query, **params):
+    response = client.get(reverse('news:search'), {'q': query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response.context['hits']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('query', ('борщ', 'Борща', 'borsch', 'БОРЩОМ'))
+def test_search_forms_and_translit(client, news, query):
+    """Поиск находит другие формы слова и слово в транслите"""
+    news.title = 'Рецепт борща'
+    news.save()
+
+    hits = search_hits(client, query)
+
+    assert [hit.news for hit in hits] == [news]
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_and_finds_comments(client, news, author):
+    """Совпадение в заголовке выше, комментарии тоже находятся"""
+    in_text = News.objects.create(title='Кухня', text='Свёкла для борща')
+    in_title = News.objects.create(title='Борщ', text='Рецепт')
+    comment = Comment.objects.create(
+        news=news, author=author, text='Лучший борщ у бабушки'
+    )
+
+    hits = search_hits(client, 'борщ')
+
+    assert hits[0].news == in_title
+    assert {(hit.news, hit.comment) for hit in hits[1:]} == {
+        (in_text, None), (news, comment)
+    }
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, comment):
+    """Индекс обновляется при изменении и удалении"""
+    assert search_hits(client, 'комментария')
+    comment.text = 'Исправленный текст'
+    comment.save()
+    assert search_hits(client, 'комментария') == []
+    assert search_hits(client, 'исправленный')
+
+    comment.news.delete()
+
+    assert search_hits(client, 'исправленный') == []
+
+
+@pytest.mark.django_db
+def test_search_snippet_is_escaped(client, author, news):
+    """Фрагмент экранирован, найденное слово выделено"""
+    Comment.objects.create(
+        news=news, author=author, text='<script>борщ</script> горячий'
+    )
+
+    snippet = search_hits(client, 'горячий')[0].snippet
+
+    assert '&lt;script&gt;' in snippet
+    assert '<mark>горячий</mark>' in snippet
+
+
+@pytest.mark.django_db
+def test_search_pagination(client, settings):
+    """Результаты поиска делятся на страницы"""
+    settings.NEWS_SEARCH_PAGE_SIZE = 2
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст') for index in range(3)
+    )
+    call_command('rebuild_search_index', stdout=StringIO())
+
+    first = client.get(reverse('news:search'), {'q': 'новость'})
+    second = client.get(reverse('news:search'), {'q': 'новость', 'page': 2})
+
+    assert len(first.context['hits']) == 2
+    assert first.context['has_next']
+    assert len(second.context['hits']) == 1
+    assert not second.context['has_next']
+
+
+def test_detail_streams_all_comments(author_client, news, author, settings):
+    """В потоковом режиме страница отдаёт все комментарии частями"""
+    settings.NEWS_DETAIL_STREAMING = True
+    settings.NEWS_STREAM_CHUNK_SIZE = 2
+    for index in range(5):
+        Comment.objects.create(news=news, author=author, text=f'Текст {index}')
+
+    response = author_client.get(reverse('news:detail', args=(news.id,)))
+
+    assert response.streaming
+    chunks = list(response.streaming_content)
+    # Начало страницы, три части комментариев, конец страницы.
+    assert len(chunks) == 5
+    content = b''.join(chunks).decode()
+    for index in range(5):
+        assert f'Текст {index}' in content
+    assert 'Оставить комментарий' in content
+    assert 'Показать ещё' not in content
+
+
+@pytest.mark.django_db
+def test_detail_gzipped(client, news):
+    """Страница сжимается для клиентов, принимающих gzip"""
+    response = client.get(
+        reverse('news:detail', args=(news.id,)), HTTP_ACCEPT_ENCODING='gzip'
+    )
+
+    assert response['Content-Encoding'] == 'gzip'
+    assert news.title in gzip.decompress(response.content).decode()
+
+
+@pytest.mark.django_db
+def test_streamed_gzip_not_buffered(client, news, comment, settings):
+    """Сжатый поток отдаёт начало страницы, не дожидаясь конца"""
+    settings.NEWS_DETAIL_STREAMING = True
+
+    response = client.get(
+        reverse('news:detail', args=(news.id,)), HTTP_ACCEPT_ENCODING='gzip'
+    )
+
+    assert response['Content-Encoding'] == 'gzip'
+    chunks = iter(response.streaming_content)
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    head = decompressor.decompress(next(chunks) + next(chunks)).decode()
+    assert news.title in head
+    assert comment.text not in head
+
+
+def test_search_not_gzipped(author_client, news):
+    """Поиск не сжимается (BREACH), страница новости сжимается"""
+    search = author_client.get(
+        reverse('news:search'), {'q': news.title},
+        HTTP_ACCEPT_ENCODING='gzip',
+    )
+    detail = author_client.get(
+        reverse('news:detail', args=(news.id,)), HTTP_ACCEPT_ENCODING='gzip'
+    )
+
+    assert not search.has_header('Content-Encoding')
+    assert news.title in search.content.decode()
+    assert detail['Content-Encoding'] == 'gzip'
+    assert news.title in gzip.decompress(detail.content).decode()
@@ -1,12 +1,25 @@
+import importlib
+import os
+import subprocess
+import sys
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
 from pytest_django.asserts import assertRedirects, assertFormError
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.db.utils import ConnectionDoesNotExist
+from django.test import Client
 from django.urls import reverse
 
 from conftest import TEXT_COMMENT
 from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.models import Comment, News
+from news.cleanup import delete_comments
+from news.moderation import check_bad_words_file, contains_bad_words
+from yacommon.routers import PrimaryReplicaRouter, pin_primary
 
 
 @pytest.mark.django_db
@@ -104,3 +117,363 @@ def test_user_cant_edit_comment_of_another_user(
     assert response.status_code == HTTPStatus.NOT_FOUND
     comment.refresh_from_db()
     assert comment.text == TEXT_COMMENT
+
+
+def test_comment_count_follows_comments(author_client, news, comment):
+    """Счётчик комментариев меняется при создании и удалении"""
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    url = reverse('news:detail', args=(news.id,))
+
+    author_client.post(url, data={'text': 'Ещё один'})
+
+    news.refresh_from_db()
+    assert news.comment_count == 2
+    author_client.delete(reverse('news:delete', args=(comment.id,)))
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(news, comment):
+    """Команда recount_comments восстанавливает счётчик"""
+    News.objects.update(comment_count=100)
+
+    call_command('recount_comments', stdout=StringIO())
+
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_recount_comments_resets_cache(client, news, comment):
+    """После пересчёта главная страница показывает новые счётчики"""
+    News.objects.update(comment_count=100)
+    client.get(reverse('news:home'))
+
+    call_command('recount_comments', stdout=StringIO())
+
+    response = client.get(reverse('news:home'))
+    assert 'Комментариев: 100' not in response.content.decode()
+    assert 'Комментариев: 1' in response.content.decode()
+
+
+def test_bad_words_file_reloaded(tmp_path, settings):
+    """Список запрещённых слов подхватывается из файла при изменении"""
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# комментарий\nбяка\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    assert contains_bad_words('Вот БЯКА какая')
+    assert not contains_bad_words(f'Просто {BAD_WORDS[0]}')
+
+    words_file.write_text('злюка\n', encoding='utf-8')
+    os.utime(words_file, ns=(0, 0))
+
+    assert contains_bad_words('злюка')
+    assert not contains_bad_words('бяка')
+
+
+def test_missing_bad_words_file_keeps_last_words(tmp_path, settings, caplog):
+    """Пропавший файл слов не ломает проверку комментариев"""
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('бяка\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    assert contains_bad_words('бяка')
+
+    words_file.unlink()
+
+    assert contains_bad_words('бяка')
+    assert contains_bad_words('и снова бяка')
+    assert len(caplog.records) == 1
+    with pytest.raises(ImproperlyConfigured, match='не найден'):
+        check_bad_words_file()
+
+
+@pytest.mark.django_db
+def test_delete_comments_skips_already_deleted(news, author, comment):
+    """Уже удалённый комментарий не вычитается из счётчика второй раз"""
+    other = Comment.objects.create(news=news, author=author, text='Ещё')
+    comment.delete()
+
+    deleted = delete_comments([comment.pk, other.pk])
+
+    assert deleted == 1
+    news.refresh_from_db()
+    assert news.comment_count == 0
+    assert not Comment.objects.exists()
+
+
+@pytest.mark.django_db
+def test_moderate_comments_command(news, author, comment):
+    """Команда moderate_comments удаляет комментарии с запрещёнными словами"""
+    for index in range(3):
+        Comment.objects.create(
+            news=news, author=author, text=f'{index} {BAD_WORDS[0]}'
+        )
+    output = StringIO()
+
+    call_command('moderate_comments', '--batch-size=2', stdout=output)
+
+    assert list(Comment.objects.all()) == [comment]
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    assert 'Проверено комментариев: 4, удалено: 3' in output.getvalue()
+
+
+def test_create_comment_queries(
+        author_client, new_text_comment, news, django_assert_num_queries):
+    """Создание: сессия, пользователь, новость, запись, счётчик, индекс"""
+    url = reverse('news:detail', args=(news.id,))
+
+    with django_assert_num_queries(6):
+        author_client.post(url, data=new_text_comment)
+
+
+@pytest.mark.parametrize(
+    'name, queries',
+    (
+        # Сессия, пользователь, комментарий с новостью, UPDATE, индекс.
+        ('news:edit', 5),
+        # Сессия, пользователь, комментарий с новостью, DELETE, счётчик,
+        # индекс.
+        ('news:delete', 6),
+    ),
+)
+def test_comment_write_queries(
+        author_client, new_text_comment, comment, name, queries,
+        django_assert_num_queries):
+    """Комментарий загружается один раз на запрос"""
+    url = reverse(name, args=(comment.id,))
+
+    with django_assert_num_queries(queries):
+        response = author_client.post(url, data=new_text_comment)
+
+    assertRedirects(
+        response,
+        reverse('news:detail', args=(comment.news_id,)) + '#comments'
+    )
+
+
+def test_comment_html_rendered_on_save(author_client, news):
+    """HTML комментария готовится при сохранении, а не при отрисовке"""
+    text = 'Первая строка\n<b>вторая</b>'
+
+    author_client.post(
+        reverse('news:detail', args=(news.id,)), data={'text': text}
+    )
+
+    comment = Comment.objects.get()
+    assert comment.text_html == 'Первая строка<br>&lt;b&gt;вторая&lt;/b&gt;'
+
+
+@pytest.mark.django_db
+def test_news_excerpt_follows_text(news):
+    """Начало новости для ленты обновляется вместе с текстом"""
+    news.text = ' '.join(f'слово{index}' for index in range(20))
+    news.save(update_fields=['text'])
+
+    news.refresh_from_db()
+    assert news.excerpt == ' '.join(
+        f'слово{index}' for index in range(15)
+    ) + ' …'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seed_command():
+    """Команда seed создаёт согласованные данные"""
+    call_command(
+        'seed', news=30, comments=3, users=4, batch_size=7, stdout=StringIO()
+    )
+
+    assert News.objects.count() == 30
+    counts = dict(News.objects.values_list('pk', 'comment_count'))
+    News.recount_comments()
+    assert dict(News.objects.values_list('pk', 'comment_count')) == counts
+    assert sum(counts.values()) == Comment.objects.count()
+    assert not News.objects.filter(excerpt='').exists()
+    assert not Comment.objects.filter(text_html='').exists()
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied(settings):
+    """Новое соединение получает PRAGMA из настроек"""
+    settings.SQLITE_PRAGMAS = {'cache_size': -1234, 'busy_timeout': 321}
+    connection = connections.create_connection('default')
+    try:
+        connection.ensure_connection()
+        values = [
+            connection.connection.execute(f'PRAGMA {pragma}').fetchone()[0]
+            for pragma in settings.SQLITE_PRAGMAS
+        ]
+    finally:
+        connection.close()
+
+    assert values == [-1234, 321]
+
+
+def test_router_sends_reads_to_replicas(settings, django_user_model):
+    """Чтение новостей — из реплики, запись и пользователи — из основной"""
+    settings.DATABASE_REPLICAS = ['replica']
+    router = PrimaryReplicaRouter()
+
+    assert router.db_for_read(News) == 'replica'
+    assert router.db_for_read(django_user_model) == 'default'
+    assert router.db_for_write(News) == 'default'
+    with pin_primary():
+        assert router.db_for_read(News) == 'default'
+
+
+def test_client_pinned_to_primary_after_post(
+        author_client, news, new_text_comment, settings):
+    """После отправки комментария клиент читает из основной базы"""
+    # Алиаса replica нет: чтение из реплики закончилось бы ошибкой.
+    settings.DATABASE_REPLICAS = ['replica']
+    url = reverse('news:detail', args=(news.id,))
+
+    response = author_client.post(url, data=new_text_comment)
+    cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+    assert cookie['max-age'] == settings.REPLICA_PIN_SECONDS
+
+    response = author_client.get(url)
+    assert new_text_comment['text'] in response.content.decode()
+
+    del author_client.cookies[settings.REPLICA_PIN_COOKIE]
+    with pytest.raises(ConnectionDoesNotExist):
+        author_client.get(url)
+
+
+@pytest.mark.django_db
+def test_home_page_cache_filled_from_primary(client, news, settings):
+    """Лента для общего кэша читается из основной базы, а не из реплики"""
+    settings.DATABASE_REPLICAS = ['replica']
+
+    response = client.get(reverse('news:home'))
+
+    assert news.title in response.content.decode()
+
+
+@pytest.fixture
+def cached_auth(settings):
+    """Сессии и пользователи как в профиле prod"""
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+    settings.AUTHENTICATION_BACKENDS = ['yacommon.auth.CachedModelBackend']
+
+
+def test_cached_auth_skips_session_and_user_queries(cached_auth, author, news):
+    """Сессия не читается из базы, пользователь — только при промахе"""
+    client = Client()
+    client.force_login(author)
+    url = reverse('news:detail', args=(news.id,))
+
+    first = client.get(url)
+    second = client.get(url)
+
+    # Бюджет news:detail — 4: сессия, пользователь, новость, комментарии.
+    assert first.query_stats.count == 3
+    assert second.query_stats.count == 2
+
+
+def test_password_change_invalidates_cached_user(cached_auth, author, news):
+    """После смены пароля закэшированный пользователь не пускает в сессию"""
+    client = Client()
+    client.force_login(author)
+    url = reverse('news:detail', args=(news.id,))
+    assert 'form' in client.get(url).context
+
+    author.set_password('новый пароль')
+    author.save()
+
+    assert 'form' not in client.get(url).context
+
+
+def test_compile_templates_command(settings):
+    """Все шаблоны проекта компилируются без ошибок"""
+    count = len(list((settings.BASE_DIR / 'templates').rglob('*.html')))
+    out = StringIO()
+
+    call_command('compile_templates', stdout=out)
+
+    assert f'Шаблонов: {count},' in out.getvalue()
+
+
+def test_compile_templates_reports_errors(tmp_path, settings):
+    """Команда находит ошибки синтаксиса и отсутствующие шаблоны"""
+    (tmp_path / 'broken.html').write_text('{% if %}')
+    (tmp_path / 'orphan.html').write_text('{% include "missing.html" %}')
+    (tmp_path / 'dynamic.html').write_text('{% include name %}')
+    settings.TEMPLATES = [{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [tmp_path],
+    }]
+    err = StringIO()
+
+    with pytest.raises(CommandError, match='Ошибок в шаблонах: 2'):
+        call_command('compile_templates', stdout=StringIO(), stderr=err)
+
+    assert 'broken.html' in err.getvalue()
+    assert 'orphan.html: missing.html' in err.getvalue()
+
+
+def test_prod_profile_trims_apps(monkeypatch):
+    """Профиль prod без админки не загружает лишние приложения"""
+    monkeypatch.delenv('DJANGO_ADMIN', raising=False)
+    base = importlib.import_module('yanews.settings.base')
+    prod = importlib.reload(importlib.import_module('yanews.settings.prod'))
+
+    assert not prod.ADMIN_ENABLED
+    assert 'django.contrib.admin' not in prod.INSTALLED_APPS
+    assert 'django.contrib.sessions' not in prod.INSTALLED_APPS
+    assert 'yacommon.middleware.QueryCountMiddleware' not in prod.MIDDLEWARE
+    # Базовый профиль не изменился.
+    assert 'django.contrib.admin' in base.INSTALLED_APPS
+    assert 'loaders' not in base.TEMPLATES[0]['OPTIONS']
+
+
+def test_unknown_profile_rejected(settings):
+    """Неизвестное значение DJANGO_ENV — ошибка конфигурации"""
+    # Отдельный процесс: перезагрузка пакета настроек в этом оставила бы
+    # его выполненным наполовину до конца сессии.
+    result = subprocess.run(
+        [sys.executable, '-c', 'import yanews.settings'],
+        cwd=settings.BASE_DIR, env={**os.environ, 'DJANGO_ENV': 'stage'},
+        capture_output=True, text=True,
+    )
+
+    assert result.returncode != 0
+    assert 'ImproperlyConfigured' in result.stderr
+    assert 'stage' in result.stderr
+
+
+def test_startup_time_command():
+    """Команда startup_time печатает фазы старта и проверяет бюджет"""
+    out = StringIO()
+
+    call_command('startup_time', runs=1, env='dev', stdout=out)
+
+    assert 'приложения' in out.getvalue()
+    assert 'весь процесс' in out.getvalue()
+    with pytest.raises(CommandError, match='дольше бюджета'):
+        call_command(
+            'startup_time', runs=1, env='dev', budget=0, stdout=StringIO()
+        )
+
+
+def test_startup_time_prod_without_secret_key(monkeypatch):
+    """Замер профиля prod не требует DJANGO_SECRET_KEY"""
+    monkeypatch.delenv('DJANGO_SECRET_KEY', raising=False)
+    out = StringIO()
+
+    call_command('startup_time', runs=1, env='prod', stdout=out)
+
+    assert 'весь процесс' in out.getvalue()
+
+
+def test_startup_time_failure_without_stderr(monkeypatch):
+    """Падение процесса без вывода в stderr — понятная ошибка"""
+    monkeypatch.setattr(
+        subprocess, 'run',
+        lambda args, **kwargs: subprocess.CompletedProcess(args, -9, '', ''),
+    )
+
+    with pytest.raises(CommandError, match='кодом -9'):
+        call_command('startup_time', runs=1, stdout=StringIO())
@@ -0,0 +1,78 @@
+import pytest
+from django.urls import reverse
+
+from news import urls
+from news.models import Comment, News
+
+# Бюджет запросов на каждый именованный адрес news/urls.py:
+# сессия и пользователь плюс запросы самой страницы.
+QUERY_BUDGETS = {
+    'news:home': (3, None),
+    'news:search': (2, None),
+    'news:detail': (4, 'news'),
+    'news:comments': (3, 'news'),
+    'news:edit': (3, 'comment'),
+    'news:delete': (3, 'comment'),
+    'news:async_home': (3, None),
+    'news:async_detail': (4, 'news'),
+    'news:async_comments': (3, 'news'),
+}
+DATA_SIZES = (1, 25)
+
+
+def populate(size, news, django_user_model):
+    """Новости и комментарии от разных авторов в нужном количестве"""
+    users = [
+        django_user_model.objects.create(username=f'Читатель {index}')
+        for index in range(size)
+    ]
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст') for index in range(size)
+    )
+    for user in users:
+        Comment.objects.create(news=news, author=user, text='Текст')
+
+
+def test_every_route_has_budget():
+    """Для каждого адреса приложения задан бюджет запросов"""
+    names = {f'news:{pattern.name}' for pattern in urls.urlpatterns}
+
+    assert names == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize('size', DATA_SIZES)
+@pytest.mark.parametrize('name', QUERY_BUDGETS)
+def test_route_query_budget(
+        author_client, news, comment, django_user_model, name, size):
+    """Число запросов не превышает бюджет и не растёт с объёмом данных"""
+    budget, arg = QUERY_BUDGETS[name]
+    populate(size, news, django_user_model)
+    args = {'news': (news.id,), 'comment': (comment.id,), None: None}[arg]
+
+    response = author_client.get(reverse(name, args=args))
+
+    assert response.query_stats.count == budget
+
+
+@pytest.mark.django_db
+def test_query_headers_in_debug(client, news, settings):
+    """В режиме отладки число запросов отдаётся в заголовках"""
+    settings.DEBUG = True
+
+    response = client.get(reverse('news:detail', args=(news.id,)))
+
+    assert response['X-Query-Count'] == str(response.query_stats.count)
+    assert 'X-Query-Time' in response
+
+
+@pytest.mark.parametrize('size', DATA_SIZES)
+def test_streamed_detail_query_budget(
+        author_client, news, comment, django_user_model, settings, size):
+    """Запросы потока учитываются, когда поток прочитан"""
+    settings.NEWS_DETAIL_STREAMING = True
+    populate(size, news, django_user_model)
+
+    response = author_client.get(reverse('news:detail', args=(news.id,)))
+    b''.join(response.streaming_content)
+
+    assert response.query_stats.count == QUERY_BUDGETS['news:detail'][0]
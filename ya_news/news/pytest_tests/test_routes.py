@@ -1,9 +1,14 @@
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient, Client
 from pytest_django.asserts import assertRedirects
 from django.urls import reverse
 
+from news.models import News
+
 
 @pytest.mark.django_db  # Arrange
 @pytest.mark.parametrize(
@@ -29,6 +34,40 @@ def test_detail_page(client, news):
     assert response.status_code == HTTPStatus.OK  # Assert
 
 
+@pytest.mark.django_db  # Arrange
+def test_comments_page(client, comment):
+    """Фрагмент со страницей комментариев"""
+    url = reverse('news:comments', args=(comment.news_id,))
+
+    response = client.get(url)  # Act
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+    assert comment.text in response.content.decode()
+
+
+@pytest.mark.django_db  # Arrange
+@pytest.mark.parametrize('name', ('news:comments', 'news:async_comments'))
+@pytest.mark.parametrize('query', ('', '?format=json'))
+def test_comments_of_missing_news(client, news, name, query):
+    """Комментарии несуществующей новости — 404, а не пустая страница"""
+    url = reverse(name, args=(news.id + 1,)) + query
+
+    response = client.get(url)  # Act
+
+    assert response.status_code == HTTPStatus.NOT_FOUND  # Assert
+
+
+@pytest.mark.django_db  # Arrange
+def test_comments_of_news_without_comments(client, news):
+    """Новость без комментариев отдаёт пустую страницу"""
+    url = reverse('news:comments', args=(news.id,))
+
+    response = client.get(url + '?format=json')  # Act
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+    assert response.json()['comments'] == []
+
+
 @pytest.mark.parametrize(  # Arrange
     'parametrized_client, expected_status',
     (
@@ -65,3 +104,166 @@ def test_redirect_for_anonymous_client(client, name, comment):
     response = client.get(url)  # Act
 
     assertRedirects(response, expected_url)  # Assert
+
+
+@pytest.mark.django_db  # Arrange
+def test_detail_not_modified(client, comment, django_assert_num_queries):
+    """Повторный запрос без изменений: 304 без отрисовки страницы"""
+    url = reverse('news:detail', args=(comment.news_id,))
+    etag = client.get(url)['ETag']
+
+    # Сессия не создана, поэтому только запрос новости.
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)  # Act
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED  # Assert
+    assert response.content == b''
+
+
+@pytest.mark.django_db  # Arrange
+@pytest.mark.parametrize(
+    'change',
+    (
+        lambda comment: comment.delete(),
+        lambda comment: comment.save(),
+        lambda comment: News.objects.filter(pk=comment.news_id).update(
+            title='Новый заголовок'
+        ),
+    ),
+    ids=('delete', 'edit', 'news_edit'),
+)
+def test_detail_etag_changes(client, comment, change):
+    """После изменения новости или комментариев страница отдаётся заново"""
+    url = reverse('news:detail', args=(comment.news_id,))
+    etag = client.get(url)['ETag']
+    change(comment)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)  # Act
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+
+
+@pytest.mark.django_db  # Arrange
+def test_detail_etag_depends_on_user(client, author_client, news):
+    """Страница автора и анонима различается версией"""
+    url = reverse('news:detail', args=(news.id,))
+    etag = client.get(url)['ETag']
+
+    response = author_client.get(url, HTTP_IF_NONE_MATCH=etag)  # Act
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+
+
+@pytest.mark.django_db  # Arrange
+@pytest.mark.parametrize('name', ('news:detail', 'news:async_detail'))
+def test_detail_etag_changes_on_relogin(author, news, name):
+    """После повторного входа форма приходит с новым токеном CSRF"""
+    author.set_password('password')
+    author.save()
+    client = Client(enforce_csrf_checks=True)
+    credentials = {'username': author.username, 'password': 'password'}
+
+    def login():
+        client.get(reverse('users:login'))
+        client.post(reverse('users:login'), {
+            **credentials,
+            'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+        })
+
+    login()
+    url = reverse(name, args=(news.id,))
+    etag = client.get(url)['ETag']
+    client.get(reverse('users:logout'))
+    login()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)  # Act
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+    response = client.post(reverse('news:detail', args=(news.id,)), {
+        'text': 'Текст',
+        'csrfmiddlewaretoken': response.context['csrf_token'],
+    })
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.django_db  # Arrange
+@pytest.mark.parametrize('name', ('news:detail', 'news:async_detail'))
+def test_detail_ignores_if_modified_since(client, comment, name):
+    """Удаление комментария не двигает дат: версия страницы — только ETag"""
+    url = reverse(name, args=(comment.news_id,))
+    assert 'Last-Modified' not in client.get(url)
+    comment.delete()
+
+    response = client.get(  # Act
+        url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+    )
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+
+
+async def async_request(client, method, url, **headers):
+    """Запрос асинхронным клиентом; заголовки — в виде If-None-Match"""
+    return await getattr(client, method)(url, **headers)
+
+
+@pytest.mark.django_db  # Arrange
+@pytest.mark.parametrize(
+    'name, async_name',
+    (
+        ('news:home', 'news:async_home'),
+        ('news:detail', 'news:async_detail'),
+        ('news:comments', 'news:async_comments'),
+    ),
+)
+def test_async_pages_match_sync(
+        author_client, author, comment, name, async_name):
+    """Асинхронные страницы отдают то же, что и синхронные"""
+    args = None if name == 'news:home' else (comment.news_id,)
+    expected = author_client.get(reverse(name, args=args))
+    client = AsyncClient()
+    client.force_login(author)
+
+    response = async_to_sync(async_request)(  # Act
+        client, 'get', reverse(async_name, args=args)
+    )
+
+    assert response.status_code == HTTPStatus.OK  # Assert
+    assert response.get('ETag') == expected.get('ETag')
+    for marker in (comment.news.title, comment.text):
+        assert (
+            marker in response.content.decode()
+        ) == (marker in expected.content.decode())
+
+
+@pytest.mark.django_db  # Arrange
+def test_async_detail_not_modified_and_read_only(news):
+    """Асинхронная страница новости отвечает 304 и не принимает POST"""
+    client = AsyncClient()
+    url = reverse('news:async_detail', args=(news.id,))
+    etag = async_to_sync(async_request)(client, 'get', url)['ETag']
+
+    response = async_to_sync(async_request)(  # Act
+        client, 'get', url, **{'If-None-Match': etag}
+    )
+    post_response = async_to_sync(async_request)(client, 'post', url)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED  # Assert
+    assert post_response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db  # Arrange
+def test_async_home_with_database_cache(news, settings):
+    """Асинхронная лента не трогает кэш в базе из цикла событий"""
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'news_cache',
+    }}
+    call_command('createcachetable')
+    client = AsyncClient()
+    url = reverse('news:async_home')
+
+    first = async_to_sync(async_request)(client, 'get', url)  # Act
+    second = async_to_sync(async_request)(client, 'get', url)
+
+    assert first.status_code == second.status_code == HTTPStatus.OK
+    assert second.content == first.content  # Assert
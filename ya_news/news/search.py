@@ -0,0 +1,241 @@
+"""
+Полнотекстовый поиск по новостям и комментариям.
+
+Индекс — таблица SQLite FTS5, в которую складываются не исходные
+тексты, а основы слов латиницей: «Борща», «борщ» и «borsch» дают
+одну и ту же основу. Поэтому и запрос, и фрагменты с подсветкой
+строятся на стороне Python по тем же правилам.
+"""
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+from django.db import connections, router
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment, News
+
+FTS_TABLE = 'news_search_fts'
+SNIPPET_WORDS = 24
+BATCH_SIZE = 2000
+
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile('[а-яё]')
+NOT_WORD = re.compile(r'\W')
+
+INSERT_SQL = (
+    f'INSERT OR REPLACE INTO {FTS_TABLE}(rowid, title, text) '
+    f'VALUES (%s, %s, %s)'
+)
+DELETE_SQL = f'DELETE FROM {FTS_TABLE} WHERE rowid = %s'
+
+SearchHit = namedtuple('SearchHit', 'news comment snippet')
+
+_local = threading.local()
+
+
+def _stem(word):
+    # Стеммер хранит состояние между вызовами: свой на каждый поток.
+    stemmer = getattr(_local, 'stemmer', None)
+    if stemmer is None:
+        # Импорт при первом поиске, а не при старте процесса:
+        # snowballstemmer и pytils вместе загружаются десятки мс.
+        import snowballstemmer
+
+        stemmer = _local.stemmer = snowballstemmer.stemmer('russian')
+    return stemmer.stemWord(word)
+
+
+@lru_cache(maxsize=100_000)
+def canonical(word):
+    """Основа слова латиницей."""
+    from pytils.translit import translify
+
+    word = word.lower().replace('ё', 'е')
+    if not CYRILLIC.search(word):
+        return word
+    try:
+        return NOT_WORD.sub('', translify(_stem(word)))
+    except ValueError:
+        return word
+
+
+def query_terms(word):
+    """
+    Основы, по которым ищется слово запроса.
+
+    Слово латиницей может оказаться и английским словом,
+    и русским в транслите — ищем оба варианта.
+    """
+    terms = {canonical(word)}
+    if not CYRILLIC.search(word.lower()):
+        from pytils.translit import detranslify
+
+        try:
+            terms.add(canonical(detranslify(word)))
+        except ValueError:
+            pass
+    return sorted(term for term in terms if term)
+
+
+def normalize(text):
+    return ' '.join(canonical(word) for word in WORD.findall(text))
+
+
+def fts_query(query):
+    """Запрос FTS5: все слова запроса, каждое по началу основы."""
+    groups = []
+    for word in WORD.findall(query):
+        terms = query_terms(word)
+        if terms:
+            groups.append(
+                '(' + ' OR '.join(f'"{term}"*' for term in terms) + ')'
+            )
+    return ' AND '.join(groups)
+
+
+def snippet(text, query):
+    """Фрагмент текста вокруг первого совпадения, слова выделены <mark>."""
+    terms = tuple(
+        term for word in WORD.findall(query) for term in query_terms(word)
+    )
+    words = list(WORD.finditer(text))
+    matched = {
+        index for index, match in enumerate(words)
+        if terms and canonical(match.group()).startswith(terms)
+    }
+    start = max(min(matched, default=0) - SNIPPET_WORDS // 4, 0)
+    window = words[start:start + SNIPPET_WORDS]
+    if not window:
+        return ''
+    parts = ['…'] if start else []
+    position = window[0].start() if start else 0
+    for index, match in enumerate(window, start):
+        parts.append(escape(text[position:match.start()]))
+        word = escape(match.group())
+        parts.append(f'<mark>{word}</mark>' if index in matched else word)
+        position = match.end()
+    if start + SNIPPET_WORDS < len(words):
+        parts.append('…')
+    else:
+        parts.append(escape(text[position:]))
+    return mark_safe(''.join(parts))
+
+
+def _rowid(model, pk):
+    # Новости и комментарии делят одну таблицу: чётные и нечётные rowid.
+    return pk * 2 + (model is Comment)
+
+
+def _entries(model, rows):
+    for pk, title, text in rows:
+        yield _rowid(model, pk), normalize(title), normalize(text)
+
+
+def index(model, rows, using='default'):
+    """
+    Добавляет или обновляет записи индекса.
+
+    rows — тройки (pk, заголовок, текст); у комментариев нет заголовка.
+    """
+    if connections[using].vendor != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(INSERT_SQL, list(_entries(model, rows)))
+
+
+def unindex(model, pks, using='default'):
+    if connections[using].vendor != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            DELETE_SQL, [(_rowid(model, pk),) for pk in pks]
+        )
+
+
+def _comment_rows(queryset):
+    for pk, text in queryset.values_list('pk', 'text').iterator():
+        yield pk, '', text
+
+
+def rebuild(using='default', batch_size=BATCH_SIZE):
+    """Перестраивает индекс целиком, таблицы читаются потоком."""
+    if connections[using].vendor != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        sources = (
+            (News, News.objects.using(using).values_list(
+                'pk', 'title', 'text'
+            ).iterator()),
+            (Comment, _comment_rows(Comment.objects.using(using))),
+        )
+        for model, rows in sources:
+            batch = []
+            for entry in _entries(model, rows):
+                batch.append(entry)
+                if len(batch) == batch_size:
+                    cursor.executemany(INSERT_SQL, batch)
+                    batch = []
+            cursor.executemany(INSERT_SQL, batch)
+
+
+def search(query, offset=0, limit=20):
+    """
+    Найденные новости и комментарии в порядке релевантности.
+
+    Совпадение в заголовке новости весит больше, чем в тексте.
+    """
+    match = fts_query(query)
+    alias = router.db_for_read(News)
+    connection = connections[alias]
+    if not match or connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s OFFSET %s',
+            (match, limit, offset)
+        )
+        rowids = [row[0] for row in cursor.fetchall()]
+    # Все три запроса — к одной и той же реплике.
+    news = News.objects.using(alias).in_bulk(
+        [rowid // 2 for rowid in rowids if not rowid % 2]
+    )
+    comments = Comment.objects.using(alias).select_related(
+        'news', 'author'
+    ).in_bulk(
+        [rowid // 2 for rowid in rowids if rowid % 2]
+    )
+    hits = []
+    for rowid in rowids:
+        if rowid % 2:
+            comment = comments.get(rowid // 2)
+            if comment is not None:
+                hits.append(SearchHit(
+                    comment.news, comment, snippet(comment.text, query)
+                ))
+        elif rowid // 2 in news:
+            item = news[rowid // 2]
+            hits.append(SearchHit(item, None, snippet(item.text, query)))
+    return hits
+
+
+def install_fts(using='default', **kwargs):
+    """Создаёт таблицу индекса после миграций, если её ещё нет."""
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = %s", [FTS_TABLE]
+        ).fetchone()
+        if exists:
+            return
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            f"title, text, tokenize='unicode61 remove_diacritics 2')"
+        )
+    rebuild(using)
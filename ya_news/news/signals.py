@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache, search
+from .models import Comment, News
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    """Увеличиваем счётчик комментариев новости."""
+    if created and not raw:
+        News.shift_comment_count(instance.news_id, 1)
+        cache.invalidate_news(instance.news_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Уменьшаем счётчик комментариев новости."""
+    News.shift_comment_count(instance.news_id, -1)
+    cache.invalidate_news(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def news_changed(sender, instance, **kwargs):
+    """Сбрасываем кэш после изменения новости."""
+    cache.invalidate_news(instance.pk)
+
+
+@receiver(post_save, sender=News)
+def news_saved_to_index(sender, instance, using, **kwargs):
+    """Обновляем новость в поисковом индексе."""
+    search.index(
+        News, [(instance.pk, instance.title, instance.text)], using
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved_to_index(sender, instance, using, **kwargs):
+    """Обновляем комментарий в поисковом индексе."""
+    search.index(Comment, [(instance.pk, '', instance.text)], using)
+
+
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=Comment)
+def removed_from_index(sender, instance, using, **kwargs):
+    """Убираем удалённую запись из поискового индекса."""
+    search.unindex(sender, [instance.pk], using)
@@ -1,11 +1,25 @@
+import hashlib
+from datetime import date, datetime
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db import router
+from django.db.models import Max
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
+from yacommon.middleware import gzip_exempt
+from yacommon.streaming import stream_template
 
+from . import cache as news_cache
+from . import search
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import keyset_page
 
 
 class NewsList(generic.ListView):
@@ -13,27 +27,187 @@ class NewsList(generic.ListView):
     model = News
     template_name = 'news/home.html'
 
+    def get(self, request, *args, **kwargs):
+        """Анонимам отдаём первую страницу ленты из кэша."""
+        if request.user.is_authenticated or request.GET.get('cursor'):
+            return super().get(request, *args, **kwargs)
+        key = news_cache.home_page_key()
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        response = super().get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda response: cache.set(
+                key, response.content, settings.NEWS_CACHE_TIMEOUT
+            )
+        )
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['fragment_timeout'] = settings.NEWS_CACHE_TIMEOUT
+        context['next_cursor'] = self.next_cursor
+        return context
+
     def get_queryset(self):
-        """
-        Выводим только несколько последних новостей.
+        news, self.next_cursor = home_page(self.request.GET.get('cursor'))
+        return news
+
+
+def home_page(cursor=None):
+    """
+    Одна страница ленты, начиная с курсора.
+
+    Размер страницы определяется в настройках проекта. Лента и её
+    фрагменты попадают в общий кэш, поэтому читаются из основной базы:
+    страница из отстающей реплики осталась бы в кэше после сброса.
+    """
+    return keyset_page(
+        News.objects.using(router.db_for_write(News)),
+        'date',
+        settings.NEWS_COUNT_ON_HOME_PAGE,
+        cursor=cursor,
+        parse_value=date.fromisoformat,
+    )
+
+
+@method_decorator(gzip_exempt, name='dispatch')
+class NewsSearch(generic.TemplateView):
+    """Поиск по новостям и комментариям."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        try:
+            page = max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            raise Http404('Некорректный номер страницы.')
+        size = settings.NEWS_SEARCH_PAGE_SIZE
+        hits = search.search(query, (page - 1) * size, size + 1)
+        context.update(
+            query=query,
+            hits=hits[:size],
+            page=page,
+            has_next=len(hits) > size,
+        )
+        return context
+
+
+def comments_page(news_id, cursor=None):
+    """Страница комментариев к новости в порядке их создания."""
+    return keyset_page(
+        Comment.objects.filter(news_id=news_id).select_related('author'),
+        'created',
+        settings.COMMENTS_COUNT_ON_PAGE,
+        cursor=cursor,
+        parse_value=datetime.fromisoformat,
+        descending=False,
+    )
+
+
+def existing_comments_page(news_id, cursor=None):
+    """
+    comments_page для адреса со страницами комментариев.
+
+    Для несуществующей новости — 404. Новость проверяется отдельным
+    запросом только при пустой странице: раз есть комментарии,
+    есть и новость.
+    """
+    comments, next_cursor = comments_page(news_id, cursor)
+    if not comments and not News.objects.filter(pk=news_id).exists():
+        raise Http404('Новость не найдена.')
+    return comments, next_cursor
+
+
+def comments_json(comments, next_cursor):
+    return {
+        'comments': [
+            {
+                'id': comment.pk,
+                'author': str(comment.author),
+                'created': comment.created.isoformat(),
+                'text': comment.text,
+            }
+            for comment in comments
+        ],
+        'next_cursor': next_cursor,
+    }
+
 
-        Их количество определяется в настройках проекта.
-        """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+class CommentsPageMixin:
+    """
+    Добавляет в контекст первую страницу комментариев к новости.
 
+    Если комментарии отдаются потоком, страница не загружается.
+    """
+    stream_comments = False
 
-class NewsDetail(generic.DetailView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if not self.stream_comments:
+            context['comments'], context['next_cursor'] = comments_page(
+                self.object.pk
+            )
+        context['news_id'] = self.object.pk
+        return context
+
+
+def detail_news(request, pk):
+    """
+    Новость с отметками последних изменений её комментариев.
+
+    Загружается одним запросом и запоминается на время запроса:
+    по ней строятся и валидаторы кэша, и сама страница.
+    """
+    news = getattr(request, '_detail_news', None)
+    if news is None or news.pk != pk:
+        news = request._detail_news = get_object_or_404(
+            News.objects.annotate(
+                last_comment=Max('comment__created'),
+                last_comment_edit=Max('comment__updated'),
+            ),
+            pk=pk,
+        )
+    return news
+
+
+def news_etag(request, pk):
+    """
+    Версия страницы новости.
+
+    Кроме дат учитывает текст новости, число комментариев (удаление
+    не двигает даты), пользователя (ему показываются форма и ссылки
+    на правку своих комментариев) и секрет CSRF: при повторном входе
+    он меняется, а пользователь тот же, и браузер показал бы форму
+    со старым токеном. Last-Modified не отдаётся: правка новости
+    и удаление комментария не меняют ни одну из дат, и ответ на один
+    If-Modified-Since был бы устаревшим.
+    """
+    news = detail_news(request, pk)
+    state = (
+        news.title, news.text, news.date, news.comment_count,
+        news.last_comment, news.last_comment_edit, request.user.pk,
+        request.META.get('CSRF_COOKIE'),
+    )
+    return hashlib.md5(repr(state).encode()).hexdigest()
+
+
+class NewsDetail(CommentsPageMixin, generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
+    @method_decorator(condition(etag_func=news_etag))
+    def get(self, request, *args, **kwargs):
+        """На повторный запрос без изменений отвечаем 304."""
+        return super().get(request, *args, **kwargs)
+
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+        return detail_news(self.request, self.kwargs['pk'])
+
+    @property
+    def stream_comments(self):
+        return settings.NEWS_DETAIL_STREAMING
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -41,9 +215,44 @@ class NewsDetail(generic.DetailView):
             context['form'] = CommentForm()
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        """В потоковом режиме отдаём все комментарии частями."""
+        if not self.stream_comments:
+            return super().render_to_response(context, **response_kwargs)
+        return stream_template(
+            self.request,
+            self.template_name,
+            'news/comments.html',
+            context,
+            'comments',
+            Comment.objects.filter(news_id=self.object.pk)
+            .select_related('author').order_by('created', 'pk'),
+            settings.NEWS_STREAM_CHUNK_SIZE,
+        )
+
+
+class NewsComments(generic.TemplateView):
+    """
+    Следующие страницы комментариев к новости.
+
+    По умолчанию отдаёт HTML-фрагмент, с ?format=json — JSON.
+    """
+    template_name = 'news/comments.html'
+
+    def get(self, request, *args, **kwargs):
+        comments, next_cursor = existing_comments_page(
+            kwargs['pk'], request.GET.get('cursor')
+        )
+        if request.GET.get('format') == 'json':
+            return JsonResponse(comments_json(comments, next_cursor))
+        return self.render_to_response(self.get_context_data(
+            comments=comments, next_cursor=next_cursor, news_id=kwargs['pk']
+        ))
+
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentsPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -63,8 +272,9 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
@@ -83,14 +293,15 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
         """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news')
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
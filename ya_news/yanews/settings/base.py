@@ -0,0 +1,164 @@
+"""
+Общие настройки всех профилей ya_news.
+
+Значения, которые различаются между машинами, берутся
+из переменных окружения DJANGO_*.
+"""
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Общий код проектов (yacommon) лежит в корне репозитория.
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.append(str(BASE_DIR.parent))
+
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+(',
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'yacommon.apps.YacommonConfig',
+    'news.apps.NewsConfig',
+]
+
+MIDDLEWARE = [
+    'yacommon.middleware.QueryCountMiddleware',
+    'yacommon.middleware.PinPrimaryMiddleware',
+    'yacommon.middleware.GZipMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yanews.urls'
+
+# Админка по адресу /admin/; профиль prod отключает её.
+ADMIN_ENABLED = True
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yanews.wsgi.application'
+
+# Компилировать все шаблоны при старте процесса (yacommon.precompile).
+TEMPLATES_PRECOMPILE = False
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DJANGO_DB_PATH', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+# Чтение моделей из REPLICA_APPS распределяется по репликам —
+# алиасам из DATABASES. Локально реплика может быть копией файла:
+#     DATABASES['replica'] = {
+#         'ENGINE': 'django.db.backends.sqlite3',
+#         'NAME': BASE_DIR / 'replica.sqlite3',
+#         'TEST': {'MIRROR': 'default'},
+#     }
+#     DATABASE_REPLICAS = ['replica']
+# и sqlite3 db.sqlite3 ".backup replica.sqlite3".
+DATABASE_ROUTERS = ['yacommon.routers.PrimaryReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_APPS = {'news'}
+# После записи клиент читает из основной базы, пока реплики догоняют.
+REPLICA_PIN_COOKIE = 'pin_primary'
+REPLICA_PIN_SECONDS = 10
+
+# PRAGMA для каждого нового соединения с SQLite, см. settings.prod.
+SQLITE_PRAGMAS = {}
+
+# Для нескольких процессов подключите общий бэкенд, например
+# django.core.cache.backends.filebased.FileBasedCache
+# или django.core.cache.backends.db.DatabaseCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yanews',
+    }
+}
+
+
+# Срок жизни пользователя в кэше yacommon.auth.CachedModelBackend (prod).
+# Сигналы сбрасывают только кэш своего процесса, поэтому с LocMemCache
+# в нескольких процессах смена пароля доходит до остальных не позже
+# этого срока; с общим кэшем — сразу.
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+
+AUTH_PASSWORD_VALIDATORS = []
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Имена маршрутов, а не reverse_lazy: импорт django.urls из настроек
+# тянет за собой django.http и ORM ещё до загрузки приложений.
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'news:home'
+
+NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_PAGE = 50
+
+# Страница новости со всеми комментариями, отдаваемыми потоком
+# по NEWS_STREAM_CHUNK_SIZE (yacommon.streaming), вместо первой страницы
+# комментариев. Только под WSGI.
+NEWS_DETAIL_STREAMING = False
+NEWS_STREAM_CHUNK_SIZE = 100
+
+NEWS_SEARCH_PAGE_SIZE = 20
+
+# Файл со списком запрещённых слов, по одному в строке.
+# Перечитывается при изменении; без файла используется news.moderation.
+# Путь проверяется при старте, пропавший позже файл оставляет прежний
+# список слов.
+BAD_WORDS_FILE = None
+
+# Кэш сбрасывается сигналами, таймаут лишь ограничивает срок жизни записей.
+NEWS_CACHE_TIMEOUT = 60 * 60
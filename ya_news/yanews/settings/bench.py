@@ -0,0 +1,11 @@
+"""
+Профиль для бенчмарков: боевые настройки плюс счётчик запросов.
+
+Ключ задан здесь, чтобы бенчмарки запускались без окружения.
+"""
+from .prod import *  # noqa: F401, F403
+from .prod import MIDDLEWARE
+
+SECRET_KEY = 'bench-only-secret-key'
+
+MIDDLEWARE = ['yacommon.middleware.QueryCountMiddleware', *MIDDLEWARE]
@@ -0,0 +1,4 @@
+"""Профиль для разработки и тестов: отладка и полный набор приложений."""
+from .base import *  # noqa: F401, F403
+
+DEBUG = True
@@ -0,0 +1,90 @@
+"""
+Профиль для боевого запуска на SQLite.
+
+    DJANGO_ENV=prod DJANGO_SECRET_KEY=... DJANGO_ALLOWED_HOSTS=example.com
+
+Без админки (DJANGO_ADMIN=1 возвращает её) процесс не загружает
+приложения admin, messages, staticfiles и sessions и не подключает
+их middleware: воркер стартует и отвечает быстрее.
+"""
+import os
+
+from .base import *  # noqa: F401, F403
+from .base import DATABASES, INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+# В проде ключ только из окружения: без него Django не стартует.
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', '')
+
+ADMIN_ENABLED = os.environ.get('DJANGO_ADMIN') == '1'
+
+# Сессии в подписанной cookie, таблица сессий не нужна.
+UNUSED_APPS = {'django.contrib.sessions'}
+UNUSED_MIDDLEWARE = {
+    # Счётчик запросов — только для тестов и бенчмарков (bench).
+    'yacommon.middleware.QueryCountMiddleware',
+}
+UNUSED_CONTEXT_PROCESSORS = {'django.template.context_processors.debug'}
+if not ADMIN_ENABLED:
+    UNUSED_APPS |= {
+        'django.contrib.admin',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    }
+    UNUSED_MIDDLEWARE.add(
+        'django.contrib.messages.middleware.MessageMiddleware'
+    )
+    UNUSED_CONTEXT_PROCESSORS.add(
+        'django.contrib.messages.context_processors.messages'
+    )
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in UNUSED_MIDDLEWARE]
+
+DATABASES = {
+    **DATABASES,
+    # Соединение живёт между запросами, а не открывается на каждый.
+    'default': {**DATABASES['default'], 'CONN_MAX_AGE': 600},
+}
+
+SQLITE_PRAGMAS = {
+    # Читатели не ждут писателя, запись идёт в журнал без fsync
+    # на каждый коммит: fsync только при контрольной точке.
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    # Ожидание блокировки вместо немедленного «database is locked».
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в килобайтах.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Сессия в подписанной cookie, пользователь из кэша: авторизованный
+# запрос не делает SELECT сессии и пользователя до вызова view.
+# Выход не отзывает скопированную cookie, но смена пароля
+# делает её недействительной (хэш пароля хранится в сессии).
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+AUTHENTICATION_BACKENDS = ['yacommon.auth.CachedModelBackend']
+
+# Шаблоны разбираются один раз на процесс и сразу при старте.
+# Изменённый файл шаблона подхватывается только после перезапуска.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [
+            name for name in TEMPLATES[0]['OPTIONS']['context_processors']
+            if name not in UNUSED_CONTEXT_PROCESSORS
+        ],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+TEMPLATES_PRECOMPILE = True
@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.conf import settings
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
@@ -6,9 +6,13 @@ from django.views.generic import CreateView
 
 urlpatterns = [
     path('', include('news.urls')),
-    path('admin/', admin.site.urls),
 ]
 
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
+
 auth_urls = ([
     path(
         'login/',
@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+from notes.cache import stats
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш и его статистика не переходят из теста в тест"""
+    for cache in caches.all():
+        cache.clear()
+    stats.reset()
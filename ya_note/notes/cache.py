@@ -0,0 +1,95 @@
+"""
+Кэш заметок по slug для каждого автора.
+
+Ключи включают версию автора: любое изменение его заметок меняет
+версию, и все прежние записи перестают читаться. Вытеснением
+занимается бэкенд кэша (LocMemCache вытесняет давно не читанные).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.shortcuts import get_object_or_404
+
+from .models import Note
+
+
+class CacheStats:
+    """Попадания и промахи кэша заметок в текущем процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        return f'{self.ratio:.2f} ({self.hits}/{self.hits + self.misses})'
+
+
+stats = CacheStats()
+
+
+def note_cache():
+    return caches[settings.NOTES_CACHE_ALIAS]
+
+
+def _version_key(author_id):
+    return f'notes:{author_id}:version'
+
+
+def bump_author(author_id):
+    """
+    Сбрасывает все закэшированные заметки автора.
+
+    Версия берётся из времени, поэтому вытесненный ключ версии
+    не возвращает к старым записям.
+    """
+    version = time.time_ns()
+    note_cache().set(_version_key(author_id), version, None)
+    return version
+
+
+def invalidate_author(author_id):
+    # Второй сброс после коммита: иначе параллельный запрос мог
+    # успеть положить в кэш строку, прочитанную до коммита.
+    bump_author(author_id)
+    transaction.on_commit(lambda: bump_author(author_id))
+
+
+def note_key(author_id, slug):
+    version = note_cache().get(_version_key(author_id))
+    if version is None:
+        version = bump_author(author_id)
+    return f'notes:{author_id}:{version}:{slug}'
+
+
+def get_note(author, slug):
+    """Заметка автора по slug: из кэша, а при промахе — из базы."""
+    key = note_key(author.pk, slug)
+    note = note_cache().get(key)
+    stats.record(note is not None)
+    if note is None:
+        # Из основной базы: копия из отстающей реплики пережила бы
+        # сброс кэша и отдавалась бы всем до смены версии.
+        note = get_object_or_404(
+            Note.objects.using(router.db_for_write(Note)),
+            slug=slug, author=author,
+        )
+        note_cache().set(key, note)
+    return note
@@ -1,9 +1,8 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
 from .models import Note
+from .slugs import allocate_slug, slug_base
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
 
@@ -16,14 +15,32 @@ class NoteForm(forms.ModelForm):
         fields = ('title', 'text', 'slug')
 
     def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
+        """
+        Проверяет уникальность slug.
+
+        Если slug не указан, он строится из заголовка
+        с ближайшим свободным суффиксом.
+        """
+        slug = self.cleaned_data.get('slug')
         if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
+            return allocate_slug(
+                slug_base(self.cleaned_data.get('title', '')),
+                self.instance.pk
+            )
         if Note.objects.filter(
                 slug=slug
         ).exclude(id=self.instance.pk).exists():
             raise ValidationError(slug + WARNING)
         return slug
+
+
+class NotesUploadForm(forms.Form):
+    """Файл с заметками для импорта."""
+    file = forms.FileField(
+        label='Файл',
+        help_text='JSON Lines или CSV с полями title, text и slug'
+    )
+    format = forms.ChoiceField(
+        label='Формат',
+        choices=(('jsonl', 'JSON Lines'), ('csv', 'CSV')),
+    )
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.transfer import FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Выгружает заметки пользователя в JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument(
+            '--output', help='Файл для выгрузки, по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = get_user_model().objects.get(
+                username=options['username']
+            )
+        except get_user_model().DoesNotExist:
+            raise CommandError('Пользователь не найден.')
+        lines = export_lines(author, options['format'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+        ) as stream:
+            stream.writelines(lines)
@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.transfer import BATCH_SIZE, FORMATS, import_notes, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Импортирует заметки пользователя из JSON Lines или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, default=None)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            author = get_user_model().objects.get(
+                username=options['username']
+            )
+        except get_user_model().DoesNotExist:
+            raise CommandError('Пользователь не найден.')
+        path = options['path']
+        fmt = options['format']
+        if fmt is None:
+            fmt = 'csv' if path.endswith('.csv') else 'jsonl'
+        started = perf_counter()
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            result = import_notes(
+                read_rows(stream, fmt), author, options['batch_size']
+            )
+        for line, error in result.errors:
+            self.stderr.write(f'Строка {line}: {error}')
+        summary = (
+            f'Добавлено заметок: {result.created}, '
+            f'с ошибками: {result.failed} '
+            f'за {perf_counter() - started:.1f} с'
+        )
+        if result.read_error:
+            raise CommandError(
+                f'Не удалось прочитать файл: {result.read_error}. {summary}'
+            )
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,17 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from notes.search import get_backend, install_fts
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс заметок.'
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        install_fts()
+        get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен за {perf_counter() - started:.1f} с'
+        ))
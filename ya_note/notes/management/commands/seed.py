@@ -0,0 +1,97 @@
+import random
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from yacommon.seeding import chunked, fast_sqlite, next_id, without_indexes
+
+from notes.models import Note
+from notes.slugs import slug_base
+
+User = get_user_model()
+
+WORDS = (
+    'купить', 'молоко', 'позвонить', 'маме', 'встреча', 'проект', 'отчёт',
+    'книга', 'идея', 'рецепт', 'пирог', 'отпуск', 'билеты', 'список',
+    'дела', 'спорт', 'врач', 'подарок', 'планы', 'неделя',
+)
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу большим объёмом случайных заметок.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notes', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора, одинаковое зерно даёт одинаковые данные.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        with fast_sqlite(), without_indexes(Note):
+            with transaction.atomic():
+                counts = self.seed(
+                    random.Random(options['seed']),
+                    options['notes'],
+                    options['users'],
+                    options['batch_size'],
+                )
+        self.stdout.write(self.style.SUCCESS(
+            'Создано пользователей: {}, заметок: {} за {:.1f} с'.format(
+                *counts, perf_counter() - started
+            )
+        ))
+
+    def texts(self, rnd, min_words, max_words, count=1000):
+        """Набор заранее собранных текстов: генерация на строку дорога."""
+        return [
+            ' '.join(
+                rnd.choices(WORDS, k=rnd.randint(min_words, max_words))
+            ).capitalize()
+            for _ in range(count)
+        ]
+
+    def seed(self, rnd, notes_count, users_count, batch_size):
+        # Транслитерация выполняется один раз на заголовок из набора,
+        # уникальность slug обеспечивает номер заметки.
+        titles = [
+            (title, slug_base(title)[:80])
+            for title in self.texts(rnd, 2, 5)
+        ]
+        texts = self.texts(rnd, 10, 60)
+
+        first_user = next_id(User)
+        # Хеш считается один раз: вход под этими пользователями не нужен.
+        password = make_password(None)
+        users = (
+            User(
+                id=first_user + index,
+                username=f'seed-{first_user + index}',
+                password=password,
+            )
+            for index in range(users_count)
+        )
+        for batch in chunked(users, batch_size):
+            User.objects.bulk_create(batch)
+
+        first_note = next_id(Note)
+        notes = []
+        for index in range(notes_count):
+            title, slug = rnd.choice(titles)
+            notes.append(Note(
+                id=first_note + index,
+                title=title,
+                text=rnd.choice(texts),
+                slug=f'{slug}-{first_note + index}',
+                author_id=first_user + rnd.randrange(users_count),
+            ))
+            if len(notes) == batch_size:
+                Note.objects.bulk_create(notes)
+                notes = []
+        Note.objects.bulk_create(notes)
+        return users_count, notes_count
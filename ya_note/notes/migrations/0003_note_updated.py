@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_note_ordering_author_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 
-from pytils.translit import slugify
+from .slugs import MAX_LENGTH, allocate_slug, slug_base
 
 
 class Note(models.Model):
@@ -17,7 +17,7 @@ class Note(models.Model):
     )
     slug = models.SlugField(
         'Адрес для страницы с заметкой',
-        max_length=100,
+        max_length=MAX_LENGTH,
         unique=True,
         blank=True,
         help_text=('Укажите адрес для страницы заметки. Используйте только '
@@ -27,12 +27,18 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
+            self.slug = allocate_slug(slug_base(self.title), self.pk)
         super().save(*args, **kwargs)
@@ -0,0 +1,32 @@
+from django.http import Http404
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+def encode_cursor(pk):
+    """Непрозрачный курсор по первичному ключу."""
+    return urlsafe_base64_encode(str(pk).encode())
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор, на некорректный отвечаем 404."""
+    try:
+        return int(force_str(urlsafe_base64_decode(cursor)))
+    except (TypeError, ValueError):
+        raise Http404('Некорректный курсор страницы.')
+
+
+def keyset_page(queryset, size, cursor=None):
+    """
+    Страница выборки по возрастанию pk вместо OFFSET.
+
+    Возвращает объекты страницы и курсор следующей страницы
+    (None, если страница последняя).
+    """
+    if cursor:
+        queryset = queryset.filter(pk__gt=decode_cursor(cursor))
+    objects = list(queryset.order_by('pk')[:size + 1])
+    if len(objects) <= size:
+        return objects, None
+    objects = objects[:size]
+    return objects, encode_cursor(objects[-1].pk)
@@ -0,0 +1,151 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from .models import Note
+
+FTS_TABLE = 'notes_note_fts'
+# Служебные символы вокруг найденных слов: текст экранируется
+# целиком, и только потом они заменяются на теги.
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+class SearchBackend:
+    """Интерфейс поиска по заметкам автора."""
+
+    def search(self, author, query, offset, limit):
+        """
+        Найденные заметки автора в порядке релевантности.
+
+        У каждой заметки есть атрибут snippet с фрагментом текста
+        (или None, если бэкенд их не строит).
+        """
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Перестраивает индекс целиком."""
+
+
+class SimpleSearchBackend(SearchBackend):
+    """Поиск подстрокой без индекса, для баз без FTS5."""
+
+    def search(self, author, query, offset, limit):
+        notes = Note.objects.filter(author=author).only('id', 'title', 'slug')
+        for word in re.findall(r'\w+', query):
+            notes = notes.filter(
+                Q(title__icontains=word) | Q(text__icontains=word)
+            )
+        notes = list(notes[offset:offset + limit])
+        for note in notes:
+            note.snippet = None
+        return notes
+
+
+class SQLiteFTSSearchBackend(SearchBackend):
+    """
+    Полнотекстовый поиск через виртуальную таблицу SQLite FTS5.
+
+    Индекс хранит только токены, тексты берутся из notes_note,
+    синхронизацию выполняют триггеры базы (см. install_fts).
+    """
+    sql = (
+        f'SELECT notes_note.id, notes_note.title, notes_note.slug, '
+        f"snippet({FTS_TABLE}, 1, '{MARK_START}', '{MARK_END}', '…', 12) "
+        f'AS snippet '
+        f'FROM {FTS_TABLE} JOIN notes_note '
+        f'ON notes_note.id = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s AND notes_note.author_id = %s '
+        f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s OFFSET %s'
+    )
+
+    def search(self, author, query, offset, limit):
+        match = fts_query(query)
+        if not match:
+            return []
+        notes = list(
+            Note.objects.raw(self.sql, (match, author.pk, limit, offset))
+        )
+        for note in notes:
+            note.snippet = highlight(note.snippet)
+        return notes
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+
+
+def fts_query(query):
+    """Запрос FTS5 из пользовательского ввода: все слова, по префиксу."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def highlight(snippet):
+    """Безопасный HTML фрагмента с выделенными словами."""
+    return mark_safe(
+        escape(snippet).replace(MARK_START, '<mark>').replace(
+            MARK_END, '</mark>'
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_backend():
+    """Бэкенд поиска из настройки NOTES_SEARCH_BACKEND."""
+    return _load_backend(settings.NOTES_SEARCH_BACKEND)
+
+
+def install_fts(using='default', **kwargs):
+    """
+    Создаёт таблицу FTS5 и триггеры синхронизации, если их нет.
+
+    Вызывается после каждой миграции: SQLite пересоздаёт таблицу
+    notes_note при изменении её полей, и триггеры теряются.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = %s", [FTS_TABLE]
+        ).fetchone()
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f"title, text, content='notes_note', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert '
+            f'AFTER INSERT ON notes_note BEGIN '
+            f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+            f'VALUES (new.id, new.title, new.text); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete '
+            f'AFTER DELETE ON notes_note BEGIN '
+            f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+            f"VALUES ('delete', old.id, old.title, old.text); END"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update '
+            f'AFTER UPDATE OF title, text ON notes_note BEGIN '
+            f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+            f"VALUES ('delete', old.id, old.title, old.text); "
+            f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+            f'VALUES (new.id, new.title, new.text); END'
+        )
+        if not exists:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Note
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def note_changed(sender, instance, **kwargs):
+    """Сбрасываем кэш заметок автора."""
+    cache.invalidate_author(instance.author_id)
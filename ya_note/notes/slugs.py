@@ -0,0 +1,107 @@
+from django.db.models import Q
+
+MAX_LENGTH = 100
+# Место под суффикс вида -12345, чтобы обрезанный slug оставался уникальным.
+SUFFIX_RESERVE = 8
+DEFAULT_SLUG = 'note'
+# Ограничение SQLite на число параметров запроса (до трёх на основу).
+PREFIXES_PER_QUERY = 300
+
+
+def slug_base(title):
+    """Транслитерирует заголовок в основу для slug."""
+    # pytils загружается при первой записи, а не при старте процесса.
+    from pytils.translit import slugify
+
+    return slugify(title)[:MAX_LENGTH] or DEFAULT_SLUG
+
+
+def _prefix_range(prefix):
+    """Условие «slug начинается с prefix», которое использует индекс."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(slug__gte=prefix, slug__lt=upper)
+
+
+def _variants(prefix):
+    """
+    Условие на slug, с которыми может совпасть основа или её вариант -N.
+
+    Короткая основа суффиксом не обрезается: достаточно её самой
+    и slug вида основа-... («note» не читает «notebook-*»). Варианты
+    длинной основы обрезаны по-разному, поэтому для неё читаются все
+    slug с её обрезанным началом.
+    """
+    if len(prefix) < MAX_LENGTH - SUFFIX_RESERVE:
+        return Q(slug=prefix) | _prefix_range(prefix + '-')
+    return _prefix_range(prefix)
+
+
+class SlugAllocator:
+    """
+    Подбор свободных slug для одной или нескольких пачек заметок.
+
+    Занятые варианты читаются одним запросом по префиксам основ
+    и запоминаются, поэтому следующие пачки запрашивают только
+    новые префиксы. При совпадении добавляется суффикс -N
+    с наименьшим свободным номером.
+    """
+
+    def __init__(self, exclude_pk=None):
+        self.exclude_pk = exclude_pk
+        self.taken = set()
+        self.prefixes = set()
+        # С какого номера искать свободный суффикс для основы: slug
+        # только занимаются, поэтому меньшие номера уже проверены.
+        self.next_numbers = {}
+
+    def _load(self, bases):
+        from .models import Note
+
+        prefixes = sorted(
+            {base[:MAX_LENGTH - SUFFIX_RESERVE] for base in bases}
+            - self.prefixes
+        )
+        self.prefixes.update(prefixes)
+        for start in range(0, len(prefixes), PREFIXES_PER_QUERY):
+            condition = Q(
+                *(
+                    _variants(prefix) for prefix
+                    in prefixes[start:start + PREFIXES_PER_QUERY]
+                ),
+                _connector=Q.OR
+            )
+            slugs = Note.objects.filter(condition).exclude(
+                pk=self.exclude_pk
+            ).values_list('slug', flat=True)
+            self.taken.update(slugs)
+
+    def _free_slug(self, base):
+        if base not in self.taken:
+            return base
+        number = self.next_numbers.get(base, 1)
+        while True:
+            suffix = f'-{number}'
+            # Длинная основа обрезается под суффикс.
+            candidate = base[:MAX_LENGTH - len(suffix)] + suffix
+            if candidate not in self.taken:
+                self.next_numbers[base] = number + 1
+                return candidate
+            number += 1
+
+    def allocate(self, bases):
+        """Свободные slug для списка основ, в том же порядке."""
+        self._load(bases)
+        slugs = []
+        for base in bases:
+            slug = self._free_slug(base)
+            self.taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+
+def allocate_slugs(bases, exclude_pk=None):
+    return SlugAllocator(exclude_pk).allocate(bases)
+
+
+def allocate_slug(base, exclude_pk=None):
+    return allocate_slugs([base], exclude_pk)[0]
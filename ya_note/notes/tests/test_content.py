@@ -1,6 +1,7 @@
+import gzip
 from http import HTTPStatus
 
-from django.test import TestCase, Client
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -57,3 +58,137 @@ class TestRoutes(TestCase):
         response = self.auth_client.get(url)
 
         self.assertIn('form', response.context)
+
+    @override_settings(NOTES_COUNT_ON_PAGE=2)
+    def test_note_list_pagination(self):
+        """Список заметок листается курсором без пропусков и повторов"""
+        for index in range(4):
+            Note.objects.create(
+                title=f'Заметка {index}', text='Текст', author=self.user
+            )
+        url, seen = reverse('notes:list'), []
+
+        while url:
+            response = self.auth_client.get(url)
+            page = response.context['object_list']
+            self.assertTrue(
+                all('text' in note.get_deferred_fields() for note in page)
+            )
+            seen.extend(page)
+            cursor = response.context['next_cursor']
+            url = cursor and reverse('notes:list') + f'?cursor={cursor}'
+
+        self.assertEqual(seen, list(Note.objects.filter(author=self.user)))
+
+    @override_settings(NOTES_LIST_STREAMING=True, NOTES_STREAM_CHUNK_SIZE=2)
+    def test_note_list_streaming(self):
+        """В потоковом режиме список отдаёт все заметки частями"""
+        for index in range(4):
+            Note.objects.create(
+                title=f'Заметка {index}', text='Текст', author=self.user
+            )
+
+        response = self.auth_client.get(reverse('notes:list'))
+
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        # Начало страницы, три части заметок, конец страницы.
+        self.assertEqual(len(chunks), 5)
+        content = b''.join(chunks).decode()
+        for note in Note.objects.filter(author=self.user):
+            self.assertIn(note.title, content)
+        self.assertNotIn('Следующие заметки', content)
+
+    def test_search_not_gzipped(self):
+        """Поиск не сжимается (BREACH), список заметок сжимается"""
+        search = self.auth_client.get(
+            reverse('notes:search'), {'q': self.note.title},
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        notes = self.auth_client.get(
+            reverse('notes:list'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+
+        self.assertFalse(search.has_header('Content-Encoding'))
+        self.assertIn(self.note.title, search.content.decode())
+        self.assertEqual(notes['Content-Encoding'], 'gzip')
+        self.assertIn(
+            self.note.title, gzip.decompress(notes.content).decode()
+        )
+
+    def test_note_list_bad_cursor(self):
+        """Некорректный курсор ведёт на 404"""
+        response = self.auth_client.get(
+            reverse('notes:list') + '?cursor=garbage'
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='Мимо Крокодил')
+        cls.auth_client = Client()
+        cls.auth_client.force_login(cls.user)
+        cls.in_title = Note.objects.create(
+            title='Рецепт борща', text='Свёкла, капуста.', author=cls.user
+        )
+        cls.in_text = Note.objects.create(
+            title='Покупки', text='Купить продукты для борща.',
+            author=cls.user
+        )
+        cls.reader = User.objects.create(username='Читатель')
+        cls.foreign = Note.objects.create(
+            title='Борщ', text='Чужая заметка', author=cls.reader
+        )
+        cls.url = reverse('notes:search')
+
+    def search(self, query, **params):
+        response = self.auth_client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.context['results']
+
+    def test_prefix_search_ranks_title_first(self):
+        """Поиск по началу слова, совпадение в заголовке выше"""
+        self.assertEqual(
+            [note.pk for note in self.search('борщ')],
+            [self.in_title.pk, self.in_text.pk]
+        )
+
+    def test_search_only_own_notes(self):
+        """В выдаче нет чужих заметок"""
+        self.assertNotIn(self.foreign.pk,
+                         [note.pk for note in self.search('борщ')])
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при изменении и удалении заметок"""
+        self.in_title.title = 'Рецепт окрошки'
+        self.in_title.save()
+        self.in_text.delete()
+
+        self.assertEqual(self.search('борщ'), [])
+        self.assertEqual([note.pk for note in self.search('окрош')],
+                         [self.in_title.pk])
+
+    def test_snippet_is_escaped(self):
+        """Фрагмент текста экранирован, найденное слово выделено"""
+        Note.objects.create(title='Разметка', text='<b>тег</b> в тексте',
+                            author=self.user)
+
+        snippet = self.search('тексте')[0].snippet
+
+        self.assertIn('&lt;b&gt;', snippet)
+        self.assertIn('<mark>тексте</mark>', snippet)
+
+    @override_settings(NOTES_SEARCH_PAGE_SIZE=1)
+    def test_search_pagination(self):
+        """Выдача делится на страницы"""
+        response = self.auth_client.get(self.url, {'q': 'борщ'})
+        self.assertTrue(response.context['has_next'])
+
+        response = self.auth_client.get(self.url, {'q': 'борщ', 'page': 2})
+        self.assertFalse(response.context['has_next'])
+        self.assertEqual([note.pk for note in response.context['results']],
+                         [self.in_text.pk])
@@ -1,12 +1,33 @@
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
 from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.db.utils import ConnectionDoesNotExist
+from django.test import (
+    Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+)
 from django.urls import reverse
 from django.template.defaultfilters import slugify
 
+from notes import cache
 from notes.models import Note
 from notes.forms import WARNING
+from notes.slugs import SlugAllocator, allocate_slugs, slug_base
+from notes.transfer import import_notes, read_rows
+from yacommon.routers import PrimaryReplicaRouter, pin_primary
 
 User = get_user_model()
 
@@ -96,6 +117,53 @@ class CreateNoteTestCase(BaseTestCase):
         expected_slug = slugify(form_data['title'])
         self.assertEqual(new_note.slug, expected_slug)
 
+    def test_auto_slug_collision_gets_suffix(self):
+        for _ in range(2):
+            Note.objects.create(
+                title='New Note', text='text', author=self.author
+            )
+
+        response = self.author_client.post(
+            self.url, data={'title': 'New Note', 'text': 'text'}
+        )
+
+        self.assertRedirects(response, reverse('notes:success'))
+        self.assertEqual(
+            sorted(Note.objects.values_list('slug', flat=True)),
+            ['new-note', 'new-note-1', 'new-note-2']
+        )
+
+    def test_allocate_slugs_batch(self):
+        Note.objects.create(title='Заголовок', text='text', author=self.author)
+        bases = [slug_base('Заголовок'), slug_base('Заголовок'), 'other']
+
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(bases)
+
+        self.assertEqual(slugs, ['zagolovok-1', 'zagolovok-2', 'other'])
+
+    def test_allocate_slugs_lowest_free_suffix(self):
+        for slug in ('report', 'report-2', 'report-2025'):
+            Note.objects.create(
+                title='Report', text='text', slug=slug, author=self.author
+            )
+
+        slugs = allocate_slugs(['report', 'report', 'report'])
+
+        self.assertEqual(slugs, ['report-1', 'report-3', 'report-4'])
+
+    def test_allocate_slugs_reads_only_base_variants(self):
+        for slug in ('note', 'note-1', 'notebook', 'notebook-1'):
+            Note.objects.create(
+                title='Note', text='text', slug=slug, author=self.author
+            )
+        allocator = SlugAllocator()
+
+        slugs = allocator.allocate(['note'])
+
+        self.assertEqual(slugs, ['note-2'])
+        self.assertEqual(allocator.taken, {'note', 'note-1', 'note-2'})
+
 
 class TestNoteEditDelete(BaseTestCase):
     COMMENT_TEXT = 'Запись'
@@ -153,3 +221,350 @@ class TestNoteEditDelete(BaseTestCase):
         self.assertFalse(
             Note.objects.filter(author=self.author, **self.form_data).exists()
         )
+
+
+class TestNoteCache(BaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', slug='slug', author=cls.author
+        )
+        cls.detail_url = reverse('notes:detail', args=(cls.note.slug,))
+        cls.edit_url = reverse('notes:edit', args=(cls.note.slug,))
+
+    def test_repeat_reads_hit_cache(self):
+        """Повторное обращение к заметке обходится без запроса к ней"""
+        self.author_client.get(self.detail_url)
+
+        # Сессия и пользователь.
+        with self.assertNumQueries(2):
+            response = self.author_client.get(self.edit_url)
+
+        self.assertEqual(response.context['object'], self.note)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_cache_invalidated_on_save_and_delete(self):
+        """Изменение и удаление заметки сбрасывают кэш автора"""
+        self.author_client.get(self.detail_url)
+
+        self.author_client.post(
+            self.edit_url,
+            data={'title': 'Новый заголовок', 'text': 'Текст', 'slug': 'slug'}
+        )
+        response = self.author_client.get(self.detail_url)
+        self.assertEqual(response.context['object'].title, 'Новый заголовок')
+
+        Note.objects.filter(pk=self.note.pk).delete()
+        response = self.author_client.get(self.detail_url)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_cache_is_per_author(self):
+        """Закэшированная заметка не видна другому пользователю"""
+        self.author_client.get(self.detail_url)
+
+        response = self.reader_client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(DEBUG=True)
+    def test_hit_ratio_header(self):
+        """В режиме отладки доля попаданий отдаётся в заголовке"""
+        self.author_client.get(self.detail_url)
+
+        response = self.author_client.get(self.detail_url)
+
+        self.assertEqual(response['X-Note-Cache-Hit-Ratio'], '0.50 (1/2)')
+
+
+class TestReplicaRouting(BaseTestCase):
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_router_sends_reads_to_replicas(self):
+        """Чтение заметок — из реплики, запись и пользователи — из основной"""
+        router = PrimaryReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Note), 'replica')
+        self.assertEqual(router.db_for_read(User), 'default')
+        self.assertEqual(router.db_for_write(Note), 'default')
+        with pin_primary():
+            self.assertEqual(router.db_for_read(Note), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_client_pinned_to_primary_after_post(self):
+        """После создания заметки клиент читает из основной базы"""
+        # Алиаса replica нет: чтение из реплики закончилось бы ошибкой.
+        response = self.author_client.post(
+            reverse('notes:add'), data={'title': 'Заметка', 'text': 'Текст'}
+        )
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        response = self.author_client.get(reverse('notes:list'))
+        self.assertEqual(len(response.context['object_list']), 1)
+
+        del self.author_client.cookies[settings.REPLICA_PIN_COOKIE]
+        with self.assertRaises(ConnectionDoesNotExist):
+            self.author_client.get(reverse('notes:list'))
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_note_cache_filled_from_primary(self):
+        """Промах кэша заметок читается из основной базы"""
+        note = Note.objects.create(
+            title='Заметка', text='Текст', slug='note', author=self.author
+        )
+
+        response = self.author_client.get(
+            reverse('notes:detail', args=(note.slug,))
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+    AUTHENTICATION_BACKENDS=['yacommon.auth.CachedModelBackend'],
+)
+class TestCachedAuth(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create(username='Автор')
+        # Клиент создаётся после подмены SESSION_ENGINE.
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.url = reverse('notes:list')
+
+    def test_session_and_user_queries_skipped(self):
+        """Сессия не читается из базы, пользователь — только при промахе"""
+        first = self.author_client.get(self.url)
+        second = self.author_client.get(self.url)
+
+        # Бюджет notes:list — 3: сессия, пользователь и заметки.
+        self.assertEqual(first.query_stats.count, 2)
+        self.assertEqual(second.query_stats.count, 1)
+
+    def test_password_change_invalidates_cached_user(self):
+        """После смены пароля кэш не пускает в старую сессию"""
+        response = self.author_client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        self.author.set_password('новый пароль')
+        self.author.save()
+
+        response = self.author_client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class TestSQLitePragmas(TestCase):
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': -1234})
+    def test_pragmas_applied_to_new_connection(self):
+        """Новое соединение получает PRAGMA из настроек"""
+        connection = connections.create_connection('default')
+        try:
+            connection.ensure_connection()
+            value = connection.connection.execute(
+                'PRAGMA cache_size'
+            ).fetchone()[0]
+        finally:
+            connection.close()
+
+        self.assertEqual(value, -1234)
+
+
+class TestSeedCommand(TransactionTestCase):
+
+    def test_seed_creates_notes_with_unique_slugs(self):
+        call_command(
+            'seed', notes=50, users=3, batch_size=7, stdout=StringIO()
+        )
+        call_command('seed', notes=5, users=1, stdout=StringIO())
+
+        self.assertEqual(Note.objects.count(), 55)
+        self.assertEqual(
+            Note.objects.values('slug').distinct().count(), 55
+        )
+
+
+class TestCompileTemplates(SimpleTestCase):
+
+    def test_project_templates_compile(self):
+        """Все шаблоны проекта компилируются без ошибок"""
+        count = len(list((settings.BASE_DIR / 'templates').rglob('*.html')))
+        out = StringIO()
+
+        call_command('compile_templates', stdout=out)
+
+        self.assertIn(f'Шаблонов: {count},', out.getvalue())
+
+    def test_errors_reported(self):
+        """Команда находит ошибки синтаксиса и отсутствующие шаблоны"""
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            (directory / 'broken.html').write_text('{% if %}')
+            (directory / 'orphan.html').write_text(
+                '{% extends "missing.html" %}'
+            )
+            (directory / 'dynamic.html').write_text('{% include name %}')
+            err = StringIO()
+
+            with override_settings(TEMPLATES=[{
+                'BACKEND': 'django.template.backends.django.DjangoTemplates',
+                'DIRS': [directory],
+            }]), self.assertRaisesMessage(
+                CommandError, 'Ошибок в шаблонах: 2'
+            ):
+                call_command(
+                    'compile_templates', stdout=StringIO(), stderr=err
+                )
+
+        self.assertIn('broken.html', err.getvalue())
+        self.assertIn('orphan.html: missing.html', err.getvalue())
+
+
+class TestSettingsProfiles(SimpleTestCase):
+
+    def test_prod_profile_trims_apps(self):
+        """Профиль prod без админки не загружает лишние приложения"""
+        base = importlib.import_module('yanote.settings.base')
+        with mock.patch.dict(os.environ, {'DJANGO_ADMIN': ''}):
+            prod = importlib.reload(
+                importlib.import_module('yanote.settings.prod')
+            )
+
+        self.assertFalse(prod.ADMIN_ENABLED)
+        self.assertLessEqual(prod.CACHES['notes']['TIMEOUT'], 60)
+        self.assertNotIn('django.contrib.admin', prod.INSTALLED_APPS)
+        self.assertNotIn('django.contrib.sessions', prod.INSTALLED_APPS)
+        self.assertNotIn(
+            'yacommon.middleware.QueryCountMiddleware', prod.MIDDLEWARE
+        )
+        # Базовый профиль не изменился.
+        self.assertIn('django.contrib.admin', base.INSTALLED_APPS)
+        self.assertNotIn('loaders', base.TEMPLATES[0]['OPTIONS'])
+
+    def test_unknown_profile_rejected(self):
+        """Неизвестное значение DJANGO_ENV — ошибка конфигурации"""
+        # Отдельный процесс: перезагрузка пакета настроек в этом оставила бы
+        # его выполненным наполовину до конца прогона.
+        result = subprocess.run(
+            [sys.executable, '-c', 'import yanote.settings'],
+            cwd=settings.BASE_DIR, env={**os.environ, 'DJANGO_ENV': 'stage'},
+            capture_output=True, text=True,
+        )
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('ImproperlyConfigured', result.stderr)
+        self.assertIn('stage', result.stderr)
+
+    def test_default_profile_without_debug(self):
+        """Без DJANGO_ENV и DJANGO_DEBUG отладка выключена"""
+        env = {
+            name: value for name, value in os.environ.items()
+            if name not in ('DJANGO_ENV', 'DJANGO_DEBUG')
+        }
+        probe = 'import yanote.settings as s; print(s.ENV, s.DEBUG)'
+
+        result = subprocess.run(
+            [sys.executable, '-c', probe], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+
+        self.assertEqual(result.stdout.split(), ['dev', 'False'])
+
+    def test_startup_time_command(self):
+        """Команда startup_time печатает фазы старта и проверяет бюджет"""
+        out = StringIO()
+
+        call_command('startup_time', runs=1, env='dev', stdout=out)
+
+        self.assertIn('приложения', out.getvalue())
+        self.assertIn('весь процесс', out.getvalue())
+        with self.assertRaisesMessage(CommandError, 'дольше бюджета'):
+            call_command(
+                'startup_time', runs=1, env='dev', budget=0,
+                stdout=StringIO(),
+            )
+
+
+class TestNotesTransfer(BaseTestCase):
+
+    def test_import_jsonl(self):
+        Note.objects.create(
+            title='Заголовок', text='Текст', slug='taken', author=self.author
+        )
+        rows = (
+            {'title': 'Первая', 'text': 'Текст', 'slug': 'taken'},
+            {'title': 'Вторая', 'text': 'Текст'},
+            {'title': 'Без текста'},
+        )
+        upload = SimpleUploadedFile('notes.jsonl', '\n'.join(
+            json.dumps(row, ensure_ascii=False) for row in rows
+        ).encode())
+
+        response = self.author_client.post(
+            reverse('notes:import'), data={'file': upload, 'format': 'jsonl'}
+        )
+
+        result = response.context['result']
+        self.assertEqual((result.created, result.failed), (2, 1))
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {'taken', 'taken-1', 'vtoraya'}
+        )
+
+    def test_import_reports_notes_saved_before_read_error(self):
+        """Ошибка чтения посреди файла сообщает о сохранённых заметках"""
+        lines = [
+            json.dumps({'title': f'Заметка {index}', 'text': 'Текст'})
+            for index in range(5)
+        ]
+        rows = read_rows(io.StringIO('\n'.join([*lines, '{'])), 'jsonl')
+
+        result = import_notes(rows, self.author, batch_size=2)
+
+        self.assertEqual(result.created, 5)
+        self.assertEqual(Note.objects.filter(author=self.author).count(), 5)
+        self.assertIsNotNone(result.read_error)
+
+        upload = SimpleUploadedFile(
+            'notes.jsonl', b'{"title": "A", "text": "B"}\n[1]\n'
+        )
+        response = self.author_client.post(
+            reverse('notes:import'), data={'file': upload, 'format': 'jsonl'}
+        )
+        self.assertFormError(
+            response, 'form', 'file',
+            'Не удалось прочитать файл: каждая строка должна быть '
+            'JSON-объектом. Заметки до этого места сохранены (1), '
+            'загрузите заново только оставшиеся строки.'
+        )
+
+    def test_export_csv_round_trip(self):
+        Note.objects.create(
+            title='Заголовок', text='Текст, с запятой', author=self.author
+        )
+        Note.objects.create(title='Чужая', text='Текст', author=self.reader)
+
+        response = self.author_client.get(
+            reverse('notes:export'), data={'format': 'csv'}
+        )
+        content = b''.join(response.streaming_content).decode()
+        Note.objects.all().delete()
+        call_command(
+            'import_notes', self.author.username, self.write_file(content),
+            stdout=StringIO()
+        )
+
+        self.assertEqual(
+            list(Note.objects.values_list('title', 'text', 'slug')),
+            [('Заголовок', 'Текст, с запятой', 'zagolovok')]
+        )
+
+    def write_file(self, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'notes.csv'
+        path.write_text(content, encoding='utf-8')
+        return str(path)
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from notes import urls
+from notes.cache import note_cache
+from notes.models import Note
+
+User = get_user_model()
+
+
+class TestQueryBudgets(TestCase):
+    # Бюджет запросов на каждый именованный адрес notes/urls.py:
+    # сессия и пользователь плюс запросы самой страницы.
+    QUERY_BUDGETS = {
+        'notes:home': 2,
+        'notes:add': 2,
+        'notes:edit': 3,
+        'notes:detail': 3,
+        'notes:delete': 3,
+        'notes:list': 3,
+        'notes:success': 2,
+        'notes:import': 2,
+        'notes:search': 2,
+        # Заметки читаются при отдаче потока; запросы потока
+        # учитываются, когда он прочитан.
+        'notes:export': 3,
+    }
+    DATA_SIZES = (1, 25)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', slug='note', author=cls.author
+        )
+        cls.author_client = Client()
+        cls.author_client.force_login(cls.author)
+
+    def populate(self, size):
+        """Добавляет автору заметки в нужном количестве."""
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Текст',
+                slug=f'note-{size}-{index}',
+                author=self.author,
+            )
+            for index in range(size)
+        )
+
+    def test_every_route_has_budget(self):
+        """Для каждого адреса приложения задан бюджет запросов"""
+        names = {f'notes:{pattern.name}' for pattern in urls.urlpatterns}
+
+        self.assertEqual(names, set(self.QUERY_BUDGETS))
+
+    def test_route_query_budget(self):
+        """Число запросов не превышает бюджет и не растёт с объёмом данных"""
+        for size in self.DATA_SIZES:
+            self.populate(size)
+            for name, budget in self.QUERY_BUDGETS.items():
+                with self.subTest(name=name, size=size):
+                    args = None
+                    if name in ('notes:edit', 'notes:detail', 'notes:delete'):
+                        args = (self.note.slug,)
+                    # Бюджет считается для промаха кэша заметок.
+                    note_cache().clear()
+
+                    response = self.author_client.get(reverse(name, args=args))
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+
+                    self.assertEqual(response.query_stats.count, budget)
+
+    @override_settings(NOTES_LIST_STREAMING=True)
+    def test_streamed_list_query_budget(self):
+        """Запросы потока учитываются, когда поток прочитан"""
+        for size in self.DATA_SIZES:
+            self.populate(size)
+            with self.subTest(size=size):
+                response = self.author_client.get(reverse('notes:list'))
+                b''.join(response.streaming_content)
+
+                self.assertEqual(
+                    response.query_stats.count,
+                    self.QUERY_BUDGETS['notes:list'],
+                )
+
+    @override_settings(DEBUG=True)
+    def test_query_headers_in_debug(self):
+        """В режиме отладки число запросов отдаётся в заголовках"""
+        response = self.author_client.get(reverse('notes:list'))
+
+        self.assertEqual(
+            response['X-Query-Count'], str(response.query_stats.count)
+        )
+        self.assertIn('X-Query-Time', response)
@@ -109,3 +109,26 @@ class TestRoutes(TestCase):
 
                 redirect_url = f'{login_url}?next={url}'
                 self.assertRedirects(response, redirect_url)
+
+    def test_detail_not_modified(self):
+        """Повторный запрос неизменённой заметки: 304 без отрисовки"""
+        self.client.force_login(self.author)
+        url = reverse('notes:detail', args=(self.note.slug,))
+        response = self.client.get(url)
+        headers = {
+            'HTTP_IF_NONE_MATCH': response['ETag'],
+            'HTTP_IF_MODIFIED_SINCE': response['Last-Modified'],
+        }
+
+        # Сессия и пользователь: заметка уже в кэше.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, **headers)
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+        self.note.text = 'Новый текст'
+        self.note.save()
+        response = self.client.get(url, **headers)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -0,0 +1,128 @@
+import csv
+import json
+from collections import namedtuple
+
+from django.db import transaction
+
+from .forms import NoteForm
+from .models import Note
+from .slugs import SlugAllocator, slug_base
+
+FIELDS = ('title', 'text', 'slug')
+FORMATS = ('jsonl', 'csv')
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+# read_error — почему чтение файла оборвалось; строки до этого места
+# уже сохранены и учтены в created.
+ImportResult = namedtuple(
+    'ImportResult', ('created', 'failed', 'errors', 'read_error'),
+    defaults=(None,)
+)
+
+
+class NoteImportForm(NoteForm):
+    """
+    Правила NoteForm для строки импорта.
+
+    Уникальность slug здесь не проверяется: slug подбирается
+    для всей пачки сразу при записи.
+    """
+
+    def clean_slug(self):
+        return self.cleaned_data.get('slug')
+
+    def validate_unique(self):
+        pass
+
+
+def read_rows(stream, fmt):
+    """
+    Строки JSON Lines или CSV из текстового потока.
+
+    На нечитаемые данные поднимает ValueError.
+    """
+    if fmt == 'csv':
+        try:
+            yield from csv.DictReader(stream)
+        except csv.Error as error:
+            raise ValueError(error)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError('каждая строка должна быть JSON-объектом')
+        yield row
+
+
+def _save_batch(notes, allocator):
+    slugs = allocator.allocate(
+        [note.slug or slug_base(note.title) for note in notes]
+    )
+    for note, slug in zip(notes, slugs):
+        note.slug = slug
+    with transaction.atomic():
+        Note.objects.bulk_create(notes)
+
+
+def import_notes(rows, author, batch_size=BATCH_SIZE):
+    """
+    Проверяет строки правилами NoteForm и сохраняет их пачками.
+
+    Каждая пачка пишется одним bulk_create в своей транзакции.
+    Если slug занят, к нему добавляется свободный суффикс.
+    Если файл нечитаем с какой-то строки, строки до неё сохраняются,
+    а причина возвращается в read_error: повторная загрузка того же
+    файла создала бы их копии.
+    """
+    created = failed = 0
+    errors, batch = [], []
+    read_error = None
+    allocator = SlugAllocator()
+    try:
+        for line, row in enumerate(rows, start=1):
+            form = NoteImportForm(
+                data={field: (row.get(field) or '') for field in FIELDS}
+            )
+            if not form.is_valid():
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((line, form.errors.as_text()))
+                continue
+            note = form.save(commit=False)
+            note.author = author
+            batch.append(note)
+            if len(batch) == batch_size:
+                _save_batch(batch, allocator)
+                created += len(batch)
+                batch = []
+    except ValueError as error:
+        read_error = str(error)
+    if batch:
+        _save_batch(batch, allocator)
+        created += len(batch)
+    return ImportResult(created, failed, errors, read_error)
+
+
+class _Echo:
+    """Буфер для csv.writer, который сразу отдаёт записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(author, fmt):
+    """Построчный экспорт заметок автора без загрузки всех в память."""
+    notes = Note.objects.filter(author=author).order_by('pk').values_list(
+        *FIELDS
+    ).iterator(chunk_size=2000)
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(FIELDS)
+        for note in notes:
+            yield writer.writerow(note)
+        return
+    for note in notes:
+        yield json.dumps(dict(zip(FIELDS, note)), ensure_ascii=False) + '\n'
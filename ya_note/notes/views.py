@@ -1,9 +1,21 @@
+import io
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
+from yacommon.middleware import gzip_exempt
+from yacommon.streaming import stream_template
 
-from .forms import NoteForm
+from . import cache
+from .forms import NoteForm, NotesUploadForm
 from .models import Note
+from .pagination import keyset_page
+from .search import get_backend
+from .transfer import FORMATS, export_lines, import_notes, read_rows
 
 
 class Home(generic.TemplateView):
@@ -25,6 +37,16 @@ class NoteBase(LoginRequiredMixin):
         """Пользователь может работать только со своими заметками."""
         return self.model.objects.filter(author=self.request.user)
 
+    def get_object(self, queryset=None):
+        """Заметка по slug из кэша заметок пользователя."""
+        return cache.get_note(self.request.user, self.kwargs['slug'])
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if settings.DEBUG:
+            response['X-Note-Cache-Hit-Ratio'] = str(cache.stats)
+        return response
+
 
 class NoteCreate(NoteBase, generic.CreateView):
     """Добавление заметки."""
@@ -50,10 +72,142 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """Список всех заметок пользователя, постранично."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """Страница с курсора из запроса, без загрузки текстов заметок."""
+        queryset = super().get_queryset().only('id', 'title', 'slug')
+        if settings.NOTES_LIST_STREAMING:
+            self.next_cursor = None
+            return queryset.order_by('pk')
+        notes, self.next_cursor = keyset_page(
+            queryset,
+            settings.NOTES_COUNT_ON_PAGE,
+            self.request.GET.get('cursor'),
+        )
+        return notes
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        """В потоковом режиме отдаём все заметки частями."""
+        if not settings.NOTES_LIST_STREAMING:
+            return super().render_to_response(context, **response_kwargs)
+        return stream_template(
+            self.request,
+            self.template_name,
+            'notes/list_items.html',
+            context,
+            'object_list',
+            self.object_list,
+            settings.NOTES_STREAM_CHUNK_SIZE,
+        )
+
+
+@method_decorator(gzip_exempt, name='dispatch')
+class NotesSearch(LoginRequiredMixin, generic.TemplateView):
+    """Полнотекстовый поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        try:
+            page = max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            raise Http404('Некорректный номер страницы.')
+        size = settings.NOTES_SEARCH_PAGE_SIZE
+        results = []
+        if query:
+            results = get_backend().search(
+                self.request.user, query, (page - 1) * size, size + 1
+            )
+        context.update(
+            query=query,
+            results=results[:size],
+            page=page,
+            has_next=len(results) > size,
+        )
+        return context
+
+
+def detail_note(request, slug):
+    """Заметка автора, полученная один раз на запрос."""
+    note = getattr(request, '_detail_note', None)
+    if note is None or note.slug != slug:
+        note = request._detail_note = cache.get_note(request.user, slug)
+    return note
+
+
+def note_etag(request, slug):
+    note = detail_note(request, slug)
+    return f'{note.pk}-{note.updated.timestamp()}'
+
+
+def note_last_modified(request, slug):
+    return detail_note(request, slug).updated
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+    @method_decorator(condition(note_etag, note_last_modified))
+    def get(self, request, *args, **kwargs):
+        """На повторный запрос без изменений отвечаем 304."""
+        return super().get(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        return detail_note(self.request, self.kwargs['slug'])
+
+
+class NotesImport(LoginRequiredMixin, generic.FormView):
+    """Импорт заметок из файла JSON Lines или CSV."""
+    template_name = 'notes/import.html'
+    form_class = NotesUploadForm
+
+    def form_valid(self, form):
+        stream = io.TextIOWrapper(
+            form.cleaned_data['file'].file, encoding='utf-8-sig'
+        )
+        try:
+            result = import_notes(
+                read_rows(stream, form.cleaned_data['format']),
+                self.request.user
+            )
+        finally:
+            stream.detach()
+        if result.read_error:
+            form.add_error('file', (
+                f'Не удалось прочитать файл: {result.read_error}. '
+                f'Заметки до этого места сохранены ({result.created}), '
+                f'загрузите заново только оставшиеся строки.'
+            ))
+        return self.render_to_response(
+            self.get_context_data(form=form, result=result)
+        )
+
+
+class NotesExport(LoginRequiredMixin, generic.View):
+    """Потоковая выгрузка всех заметок пользователя."""
+    content_types = {
+        'jsonl': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get('format', 'jsonl')
+        if fmt not in FORMATS:
+            raise Http404('Неизвестный формат выгрузки.')
+        response = StreamingHttpResponse(
+            export_lines(request.user, fmt),
+            content_type=f'{self.content_types[fmt]}; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{fmt}"'
+        )
+        return response
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
 
 application = get_asgi_application()
+
+# Приложения загружаются в get_asgi_application().
+from yacommon.precompile import warm_up  # noqa: E402
+
+warm_up()
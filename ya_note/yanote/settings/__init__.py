@@ -0,0 +1,23 @@
+"""
+Настройки ya_note.
+
+Профиль выбирается переменной окружения DJANGO_ENV: dev (по умолчанию),
+prod или bench. Профиль можно указать и напрямую, например
+DJANGO_SETTINGS_MODULE=yanote.settings.prod.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENV = os.environ.get('DJANGO_ENV', 'dev')
+
+if ENV == 'dev':
+    from .dev import *  # noqa: F401, F403
+elif ENV == 'prod':
+    from .prod import *  # noqa: F401, F403
+elif ENV == 'bench':
+    from .bench import *  # noqa: F401, F403
+else:
+    raise ImproperlyConfigured(
+        f'DJANGO_ENV={ENV!r}: ожидается dev, prod или bench.'
+    )
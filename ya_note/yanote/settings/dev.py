@@ -0,0 +1,12 @@
+"""
+Профиль для разработки и тестов: полный набор приложений.
+
+Профиль выбирается по умолчанию, а до разделения настроек ya_note
+работал с выключенным DEBUG. Поэтому отладка включается только явно,
+DJANGO_DEBUG=1: развёртывание без DJANGO_ENV не показывает трассировки.
+"""
+import os
+
+from .base import *  # noqa: F401, F403
+
+DEBUG = os.environ.get('DJANGO_DEBUG') == '1'
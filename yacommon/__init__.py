@@ -0,0 +1,8 @@
+"""
+Общий код проектов ya_news и ya_note.
+
+Подключается как приложение Django: в INSTALLED_APPS обоих проектов
+стоит yacommon, отсюда же берутся middleware, маршрутизатор баз,
+бэкенд аутентификации и команды compile_templates и startup_time.
+Каталог репозитория добавляется в sys.path настройками проектов.
+"""
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class YacommonConfig(AppConfig):
+    name = 'yacommon'
+    verbose_name = 'Общее'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,44 @@
+"""
+Бэкенд аутентификации с кэшем пользователей.
+
+AuthenticationMiddleware на каждом запросе читает пользователя
+из базы по id из сессии; CachedModelBackend берёт его из кэша.
+Запись сбрасывается сигналами при любом сохранении пользователя:
+смена пароля, is_active, is_staff и is_superuser. Права из групп
+и user_permissions в кэш не попадают — ModelBackend загружает их
+заново в каждом запросе. Изменения через QuerySet.update сигналов
+не вызывают, после них нужен invalidate_user.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+
+def user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    """
+    Сбрасывает пользователя из кэша.
+
+    Повторный сброс после коммита не даёт параллельному запросу
+    вернуть в кэш пользователя, прочитанного до коммита.
+    """
+    key = user_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который читает пользователя из кэша."""
+
+    def get_user(self, user_id):
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,21 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from yacommon.precompile import precompile
+
+
+class Command(BaseCommand):
+    help = 'Компилирует и проверяет все шаблоны проекта.'
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        count, errors = precompile()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Ошибок в шаблонах: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Шаблонов: {count}, проверено за '
+            f'{(perf_counter() - started) * 1000:.0f} мс'
+        ))
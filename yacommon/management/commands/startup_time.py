@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Выполняется в новом процессе интерпретатора: каждая фаза старта
+# отсчитывается от предыдущей.
+PROBE = '''
+import json
+from time import perf_counter
+
+marks = [perf_counter()]
+import django
+marks.append(perf_counter())
+from django.conf import settings
+settings.INSTALLED_APPS
+marks.append(perf_counter())
+django.setup()
+marks.append(perf_counter())
+from django.utils.module_loading import import_string
+import_string(settings.WSGI_APPLICATION)
+marks.append(perf_counter())
+from django.urls import get_resolver
+get_resolver().url_patterns
+marks.append(perf_counter())
+print(json.dumps([(b - a) * 1000 for a, b in zip(marks, marks[1:])]))
+'''
+PHASES = (
+    'импорт Django',
+    'настройки',
+    'приложения',
+    'WSGI: middleware, шаблоны',
+    'маршруты',
+    'весь процесс',
+)
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время старта процесса по фазам (медиана запусков).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument(
+            '--env', choices=('dev', 'prod', 'bench'),
+            help='Профиль настроек (DJANGO_ENV); по умолчанию текущий.'
+        )
+        parser.add_argument(
+            '--budget', type=float,
+            help='Ошибка, если медиана полного старта дольше, мс.'
+        )
+
+    def run_probe(self, env):
+        started = perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+        total = (perf_counter() - started) * 1000
+        if result.returncode:
+            lines = result.stderr.strip().splitlines()
+            raise CommandError(
+                lines[-1] if lines
+                else f'Процесс завершился с кодом {result.returncode}'
+            )
+        phases = json.loads(result.stdout.splitlines()[-1])
+        return [*phases, total]
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        # Профиль prod требует ключ, а процесс замера запросы не обслуживает.
+        env.setdefault('DJANGO_SECRET_KEY', 'startup-time-probe')
+        if options['env']:
+            env['DJANGO_ENV'] = options['env']
+            # Пакет настроек проекта: yanews.settings, yanote.settings.
+            project = settings.SETTINGS_MODULE.split('.')[0]
+            env['DJANGO_SETTINGS_MODULE'] = f'{project}.settings'
+        runs = [self.run_probe(env) for _ in range(options['runs'])]
+        timings = [median(values) for values in zip(*runs)]
+        for label, value in zip(PHASES, timings):
+            self.stdout.write(f'{label:<28} {value:>8.1f} мс')
+        total = timings[-1]
+        if options['budget'] is not None and total > options['budget']:
+            raise CommandError(
+                f'Старт {total:.0f} мс дольше бюджета '
+                f'{options["budget"]:.0f} мс'
+            )
@@ -0,0 +1,196 @@
+from contextlib import ExitStack
+from gzip import GzipFile
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.middleware import gzip
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer
+
+from .routers import pin_primary
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class QueryStats:
+    """
+    Счётчик SQL-запросов и их суммарного времени.
+
+    Работает как контекстный менеджер и подключается
+    ко всем соединениям с базами данных.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - started
+
+    def __enter__(self):
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+
+def _counted(content, stats):
+    """Поток, запросы которого добавляются к stats при чтении."""
+    with stats:
+        yield from content
+
+
+class QueryCountMiddleware:
+    """
+    Учитывает запросы к базе за время обработки HTTP-запроса.
+
+    При DEBUG = True добавляет заголовки X-Query-Count
+    и X-Query-Time (в миллисекундах). Запросы потокового ответа
+    выполняются после отправки заголовков: они попадают
+    в response.query_stats, когда поток прочитан, но не в заголовки.
+
+    В асинхронной цепочке (ASGI) запросы не считаются: ORM работает
+    в общем потоке sync_to_async, и обёртка соединений смешала бы
+    запросы соседних HTTP-запросов.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        with QueryStats() as stats:
+            response = self.get_response(request)
+        response.query_stats = stats
+        if response.streaming:
+            response.streaming_content = _counted(
+                response.streaming_content, stats
+            )
+        if settings.DEBUG:
+            response['X-Query-Count'] = stats.count
+            response['X-Query-Time'] = f'{stats.duration * 1000:.2f}'
+        return response
+
+
+class PinPrimaryMiddleware:
+    """
+    Закрепляет чтение за основной базой после записи.
+
+    Запрос с небезопасным методом читает из основной базы и ставит
+    cookie на REPLICA_PIN_SECONDS: пока реплики догоняют, следующие
+    запросы того же клиента тоже читают из основной базы и видят
+    только что записанные данные.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with pin_primary(self.pinned(request)):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        with pin_primary(self.pinned(request)):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def pinned(self, request):
+        return (
+            request.method not in SAFE_METHODS
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        )
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def compress_sequence(sequence):
+    """
+    Сжатие потока по частям, как django.utils.text.compress_sequence.
+
+    В Django 3.2 gzip копит сжатые данные до заполнения буфера,
+    и первые части потока уходят клиенту с опозданием. Здесь gzip
+    сбрасывается после каждой части.
+    """
+    buffer = StreamingBuffer()
+    with GzipFile(mode='wb', compresslevel=6, fileobj=buffer,
+                  mtime=0) as zfile:
+        yield buffer.read()
+        for item in sequence:
+            zfile.write(item)
+            zfile.flush()
+            yield buffer.read()
+    yield buffer.read()
+
+
+def gzip_exempt(view_func):
+    """
+    Отключает сжатие ответов представления в GZipMiddleware.
+
+    Нужно страницам, где ввод из запроса (q в поиске) отражается рядом
+    с личными данными: такое сочетание — условие атаки BREACH.
+    Для классов — method_decorator(gzip_exempt, name='dispatch').
+    """
+    view_func.gzip_exempt = True
+    return view_func
+
+
+class GZipMiddleware(gzip.GZipMiddleware):
+    """
+    GZipMiddleware, который не задерживает потоковые ответы
+    и не сжимает ответы представлений с gzip_exempt.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._gzip_exempt = getattr(view_func, 'gzip_exempt', False)
+
+    def process_response(self, request, response):
+        if getattr(request, '_gzip_exempt', False):
+            return response
+        if not response.streaming:
+            return super().process_response(request, response)
+        if response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if not gzip.re_accepts_gzip.search(accept_encoding):
+            return response
+        response.streaming_content = compress_sequence(
+            response.streaming_content
+        )
+        del response['Content-Length']
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = 'gzip'
+        return response
@@ -0,0 +1,69 @@
+"""
+Предварительная компиляция шаблонов проекта.
+
+Загружает все шаблоны из каталогов TEMPLATES['DIRS']. С кэширующим
+загрузчиком (профиль prod) каждый шаблон разбирается один раз
+при старте процесса, а не при первом запросе к странице. Заодно
+проверяется синтаксис и то, что шаблоны из {% extends %}
+и {% include %} с именем-строкой существуют.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+
+def template_names(engine):
+    """Имена всех шаблонов из каталогов DIRS."""
+    for directory in map(Path, engine.dirs):
+        for path in sorted(directory.rglob('*')):
+            if path.is_file():
+                yield path.relative_to(directory).as_posix()
+
+
+def referenced_names(template):
+    """Имена шаблонов из {% extends %} и {% include %} со строкой."""
+    for node in template.nodelist.get_nodes_by_type(
+            (ExtendsNode, IncludeNode)):
+        expression = (
+            node.parent_name if isinstance(node, ExtendsNode)
+            else node.template
+        )
+        if isinstance(expression.var, str) and not expression.filters:
+            yield expression.var
+
+
+def precompile():
+    """
+    Загружает все шаблоны проекта.
+
+    Возвращает число шаблонов и ошибки в виде {имя: текст ошибки}.
+    """
+    engine = engines['django'].engine
+    names = list(template_names(engine))
+    errors = {}
+    for name in names:
+        try:
+            template = engine.get_template(name)
+            for referenced in referenced_names(template):
+                engine.get_template(referenced)
+        except (TemplateSyntaxError, TemplateDoesNotExist) as error:
+            errors[name] = str(error)
+    return len(names), errors
+
+
+def warm_up():
+    """
+    Компилирует шаблоны при старте процесса, если TEMPLATES_PRECOMPILE.
+
+    С ошибкой в шаблоне процесс не запускается.
+    """
+    if not settings.TEMPLATES_PRECOMPILE:
+        return
+    _, errors = precompile()
+    if errors:
+        raise ImproperlyConfigured('Ошибки в шаблонах: ' + '; '.join(
+            f'{name}: {error}' for name, error in errors.items()
+        ))
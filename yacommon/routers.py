@@ -0,0 +1,50 @@
+"""
+Маршрутизация запросов к базам: запись — в основную, чтение — в реплики.
+
+Реплики перечисляются в DATABASE_REPLICAS и используются только для
+моделей приложений из REPLICA_APPS: сессии и пользователи всегда
+читаются из основной базы, иначе только что вошедший пользователь
+мог бы не найтись в отстающей реплике.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+
+@contextmanager
+def pin_primary(pinned=True):
+    """Внутри блока чтение идёт в основную базу."""
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or _pinned.get()
+            or model._meta.app_label not in settings.REPLICA_APPS
+        ):
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной базы, связи между ними допустимы.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY
@@ -0,0 +1,61 @@
+"""
+Быстрая загрузка больших объёмов данных командами seed.
+
+Записи создаются пачками через bulk_create с заранее назначенными id,
+индексы из Meta.indexes строятся заново один раз после загрузки,
+а SQLite на это время не сбрасывает журнал на диск.
+"""
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connection
+from django.db.models import Max
+
+SQLITE_PRAGMAS = {'synchronous': 'OFF', 'journal_mode': 'MEMORY'}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+@contextmanager
+def fast_sqlite():
+    """Ослабляет гарантии записи SQLite на время загрузки."""
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    with connection.cursor() as cursor:
+        previous = {}
+        for pragma, value in SQLITE_PRAGMAS.items():
+            previous[pragma] = cursor.execute(
+                f'PRAGMA {pragma}'
+            ).fetchone()[0]
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for pragma, value in previous.items():
+                cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@contextmanager
+def without_indexes(*models):
+    """Удаляет индексы из Meta.indexes и создаёт их заново после загрузки."""
+    with connection.schema_editor() as editor:
+        for model in models:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model in models:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
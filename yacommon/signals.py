@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import auth
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    """Сбрасываем пользователя из кэша аутентификации."""
+    auth.invalidate_user(instance.pk)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Настраиваем новое соединение с SQLite по SQLITE_PRAGMAS."""
+    if connection.vendor != 'sqlite':
+        return
+    # Мимо обёрток курсора: это не запросы приложения.
+    for pragma, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,63 @@
+"""
+Потоковая отрисовка страниц с длинными списками.
+
+Страница рисуется шаблоном как обычно, только вместо списка в неё
+подставляется метка stream_marker. Всё до метки уходит клиенту
+сразу, затем список рисуется шаблоном фрагмента частями по
+chunk_size записей из QuerySet.iterator(), затем остаток страницы.
+Время до первого байта и память процесса не растут с длиной списка.
+
+Под ASGI Django 3.2 перебирает поток в цикле событий, где запросы
+к базе запрещены, поэтому потоковый режим — только для WSGI.
+"""
+from django.db import router
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_MARKER = '<!-- stream -->'
+
+
+def render_chunks(list_template, context, name, queryset, chunk_size):
+    """Фрагменты списка по chunk_size объектов, объекты — в context[name]."""
+    template = get_template(list_template)
+    chunk = []
+    for item in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield template.render({**context, name: chunk})
+            chunk = []
+    if chunk:
+        yield template.render({**context, name: chunk})
+
+
+def stream_template(request, template_name, list_template, context, name,
+                    queryset, chunk_size):
+    """
+    Потоковый ответ со страницей template_name.
+
+    Список из queryset рисуется шаблоном list_template на месте
+    {{ stream_marker }}. База для списка выбирается сразу:
+    поток читается уже после middleware, когда закрепление
+    за основной базой (PinPrimaryMiddleware) снято.
+    """
+    page = render_to_string(
+        template_name,
+        {**context, 'stream_marker': mark_safe(STREAM_MARKER)},
+        request,
+    )
+    head, tail = page.split(STREAM_MARKER, 1)
+    queryset = queryset.using(router.db_for_read(queryset.model))
+    # Фрагменты рисуются без context processors: RequestContext
+    # образует циклические ссылки, и каждая часть списка держалась бы
+    # в памяти до сборки мусора. Из процессоров нужен только user.
+    context = {**context, 'user': request.user}
+
+    def content():
+        yield head
+        yield from render_chunks(
+            list_template, context, name, queryset, chunk_size
+        )
+        yield tail
+
+    return StreamingHttpResponse(content())